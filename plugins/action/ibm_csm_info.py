@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+
+from ansible import constants as C
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+
+# Options that make the module keep state on the managed node, so its result cannot be shared.
+STATEFUL_OPTIONS = ('cursor_file', 'record_dir', 'volume_catalog', 'volume_catalog_invalidate')
+
+
+class ActionModule(ActionBase):
+    """
+    Runs ibm_csm_info once for all the hosts of a task that send the same query to the same CSM server.
+
+    The first fork to run a query holds a lock on the query key while the module runs and stores its
+    result in the local temporary directory of the playbook run.  The forks of the same task running the
+    same query at the same time wait for the lock and, like the forks that run it within coalesce_ttl
+    seconds afterwards, return the stored result instead of calling the server.
+
+    The key holds the task, so a later task never gets the result of an earlier one.  A result is shared
+    once with each host, so the retries of a host in an until loop query the server again.
+    """
+
+    _supports_check_mode = True
+
+    def _query_key(self):
+        query = {'task': self._task._uuid, 'action': self._task.action, 'args': self._task.args,
+                 'check_mode': self._play_context.check_mode}
+        return hashlib.sha256(json.dumps(query, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _load_result(path, ttl):
+        if not os.path.exists(path) or time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _store_result(path, result):
+        tmp_path = path + '.tmp'
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump(result, f)
+        os.rename(tmp_path, path)
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        args = self._task.args
+        if not args.get('coalesce', True) or any(args.get(option) for option in STATEFUL_OPTIONS):
+            return merge_hash(result, self._execute_module(task_vars=task_vars))
+
+        cache_dir = os.path.join(C.DEFAULT_LOCAL_TMP, 'ibm_csm_coalesce')
+        os.makedirs(cache_dir, 0o700, exist_ok=True)
+        path = os.path.join(cache_dir, self._query_key())
+        host = (task_vars or {}).get('inventory_hostname')
+
+        with open(path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                shared = self._load_result(path + '.json', int(args.get('coalesce_ttl', 30)))
+                if shared is not None and host not in shared['hosts']:
+                    shared['hosts'].append(host)
+                    self._store_result(path + '.json', shared)
+                    shared['result']['coalesced'] = True
+                    return merge_hash(result, shared['result'])
+
+                module_result = self._execute_module(task_vars=task_vars)
+                # A failure is not shared, so the next host tries the query again.
+                if not module_result.get('failed'):
+                    self._store_result(path + '.json', {'hosts': [host], 'result': module_result})
+                module_result['coalesced'] = False
+                return merge_hash(result, module_result)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -37,8 +37,59 @@ class ModuleDocFragment(object):
           - List of changeable options when creating a connection to the CSM server.
         type: dict
         default: {'language': 'en-US', 'verify': False}
+      max_calls_per_second:
+        description:
+          - The largest number of calls per second made to the CSM server by all the modules running on the node.
+          - The limit is shared by every module process that calls the same I(hostname) and I(port), such as the
+            forks of a playbook run.  No limit is applied when not set.
+          - Can also be set with the C(CSM_MAX_CALLS_PER_SECOND) environment variable.
+        type: float
+        version_added: "1.1.0"
+      max_concurrent_calls:
+        description:
+          - The largest number of calls, logins included, in flight to the CSM server from all the modules
+            running on the node.  No limit is applied when not set.
+          - Can also be set with the C(CSM_MAX_CONCURRENT_CALLS) environment variable.
+        type: int
+        version_added: "1.1.0"
+      call_lock_dir:
+        description:
+          - The directory holding the shared state of I(max_calls_per_second) and I(max_concurrent_calls).
+          - Defaults to the temporary directory of the node.
+          - Can also be set with the C(CSM_CALL_LOCK_DIR) environment variable.
+        type: path
+        version_added: "1.1.0"
+      record_dir:
+        description:
+          - Record the responses of the CSM server to fixture files in this directory, to replay them later
+            with I(replay_dir).
+          - The password, tokens and the values of secret keys such as C(password) are replaced with C(********)
+            in the recorded calls and responses, together with the time each call took.
+          - Can also be set with the C(CSM_RECORD_DIR) environment variable.
+        type: path
+        version_added: "1.1.0"
+      replay_dir:
+        description:
+          - Answer the calls of the module from the fixture files recorded in this directory with I(record_dir),
+            without a CSM server or pyCSM.
+          - The responses to a call are replayed in the order they were recorded, the last one repeating.
+            A call that was not recorded fails the module.
+          - Can also be set with the C(CSM_REPLAY_DIR) environment variable.
+        type: path
+        version_added: "1.1.0"
+      replay_latency:
+        description:
+          - The factor applied to the recorded duration of each call when it is replayed.  C(0) replays
+            without delay.
+          - Can also be set with the C(CSM_REPLAY_LATENCY) environment variable.
+        type: float
+        default: 1.0
+        version_added: "1.1.0"
     notes:
       - For a secure connection add value 'cert' to the call_properties with the certificate.
+      - The time each call waited for I(max_calls_per_second) or I(max_concurrent_calls) is reported in
+        C(call_stats.queued_calls).
+      - The peak memory used by the module process is reported in C(call_stats.peak_rss_bytes).
     requirements:
       - pyCSM >= 1.0.1
       - python >= 3.6
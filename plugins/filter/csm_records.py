@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.errors import AnsibleFilterError
+from ansible.module_utils.six import string_types
+
+
+def _is_columnar(data):
+    return isinstance(data, dict) and set(data) == set(('columns', 'rows'))
+
+
+def csm_records(data, columns=None):
+    """
+    Turn the columnar output of ibm_csm_info back into a list of dictionaries.
+
+    Only the fields named in columns are built when it is given.  Dictionaries holding several
+    columnar lists, such as results keyed by WWN, are converted value by value.
+    """
+    if isinstance(columns, string_types):
+        columns = [columns]
+
+    if isinstance(data, dict) and not _is_columnar(data):
+        return dict((key, csm_records(value, columns)) for key, value in data.items())
+    if not _is_columnar(data):
+        return data
+
+    names = data['columns']
+    if columns is None:
+        positions = list(enumerate(names))
+    else:
+        unknown = [column for column in columns if column not in names]
+        if unknown:
+            raise AnsibleFilterError("csm_records: unknown columns {0}. Available columns are {1}."
+                                     .format(', '.join(unknown), ', '.join(names)))
+        positions = [(names.index(column), column) for column in columns]
+
+    return [dict((name, row[position]) for position, name in positions) for row in data['rows']]
+
+
+class FilterModule(object):
+
+    def filters(self):
+        return {
+            'csm_records': csm_records,
+        }
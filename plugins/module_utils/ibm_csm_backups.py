@@ -0,0 +1,89 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''Safeguarded Copy backup lists, whose backup IDs are the backup times in seconds since the epoch.'''
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import bisect
+import time as _time
+
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import unwrap_list, volume_field
+
+BACKUP_LIST_KEYS = ('backups', 'recoveredBackups', 'snapshots', 'clones', 'results', 'data')
+BACKUP_TIME_KEYS = ('backupId', 'backupid', 'backup_id', 'id', 'timestamp', 'time')
+
+
+def backup_records(data):
+    return [record for record in unwrap_list(data, keys=BACKUP_LIST_KEYS) if isinstance(record, dict)]
+
+
+def backup_time(record):
+    """Return the backup time of a backup record, or None when its ID is not a timestamp."""
+    value = volume_field(record, BACKUP_TIME_KEYS)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BackupIndex(object):
+    """The backups of a list sorted by backup time, searched with bisect."""
+
+    def __init__(self, records):
+        timed = sorted((time, position) for position, time in
+                       ((position, backup_time(record)) for position, record in enumerate(records)) if time is not None)
+        self.times = [time for time, position in timed]
+        self.records = [records[position] for time, position in timed]
+
+    def window(self, from_time=None, to_time=None, limit=None):
+        """Return the backups taken from from_time to to_time included, oldest first, keeping the newest limit ones."""
+        start = 0 if from_time is None else bisect.bisect_left(self.times, from_time)
+        end = len(self.times) if to_time is None else bisect.bisect_right(self.times, to_time)
+        if limit is not None:
+            start = max(start, end - limit)
+        return self.records[start:end]
+
+
+def filter_backups(data, from_time=None, to_time=None, latest=False, limit=None):
+    return BackupIndex(backup_records(data)).window(from_time, to_time, 1 if latest else limit)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize_backups(data, interval=None, now=None):
+    """
+    Return the retention summary of a backup list: the backup count, the oldest and newest backups,
+    the distribution of the gaps between backups, the intervals missed and an RPO estimate.
+
+    Only the backup times are kept from the records, so the summary of a long list costs a list of
+    integers.  When interval is not given, the expected interval is the median gap.
+    """
+    times = sorted(time for time in (backup_time(record) for record in backup_records(data)) if time is not None)
+    now = int(now if now is not None else _time.time())
+    summary = {'count': len(times), 'oldest': None, 'newest': None, 'gaps': None,
+               'interval': interval, 'missed_intervals': None, 'rpo_seconds': None, 'max_rpo_seconds': None}
+    if not times:
+        return summary
+
+    gaps = sorted(newer - older for older, newer in zip(times, times[1:]))
+    summary['oldest'] = times[0]
+    summary['newest'] = times[-1]
+    summary['rpo_seconds'] = max(0, now - times[-1])
+    summary['max_rpo_seconds'] = max(gaps[-1] if gaps else 0, summary['rpo_seconds'])
+    if not gaps:
+        return summary
+
+    summary['gaps'] = {'min': gaps[0], 'mean': round(float(sum(gaps)) / len(gaps), 3), 'p50': _percentile(gaps, 0.5),
+                       'p90': _percentile(gaps, 0.9), 'p99': _percentile(gaps, 0.99), 'max': gaps[-1]}
+    if interval is None:
+        summary['interval'] = interval = summary['gaps']['p50']
+    if interval > 0:
+        # A gap of about n intervals means n - 1 backups were not taken, and so does the time since the newest backup.
+        summary['missed_intervals'] = sum(max(0, int(round(float(gap) / interval)) - 1)
+                                          for gap in gaps + [summary['rpo_seconds']])
+    return summary
@@ -8,16 +8,32 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import abc
+import importlib
+import json
+import sys
+import tempfile
+import threading
+import time
 import traceback
+from contextlib import contextmanager
 
 from ansible.module_utils import six
-from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import env_fallback, missing_required_lib
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_rate_limit import RateLimiter
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_replay import FixtureStore, RecordingClient, ReplayClient, LOGIN
+
+try:
+    import resource
+
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
 
 PYCSM_IMP_ERR = None
 try:
-    from pyCSM.clients.session_client import sessionClient
-    from pyCSM.clients.hardware_client import hardwareClient
-    from pyCSM.clients.system_client import systemClient
+    # The client classes are imported by the connect_to_* methods the first time a client is used.
+    import pyCSM  # noqa: F401
 
     HAS_PYCSM = True
 except ImportError:
@@ -33,12 +49,153 @@ properties = {
     # "cert": None
 }
 
+# Keys holding the identifiers of a volume returned by the storagedevices/volumes calls
+VOLUME_ID_KEYS = ('id', 'volumeId')
+VOLUME_NAME_KEYS = ('name', 'volumeName')
+VOLUME_WWN_KEYS = ('wwn', 'volumeWWN')
+
+# pyCSM has no call to change session options, so they are set through the REST resource
+SESSION_OPTIONS_RESOURCE = '/sessions/{name}/options'
+
+# Strings up to this length that repeat in a response, such as states and storage system names, are kept once
+SHARED_STRING_MAX_LENGTH = 64
+
+
+def peak_rss_bytes():
+    """Return the peak resident memory of the module process, or None where it cannot be read."""
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def decode_json(content):
+    """Parse a JSON response body, keeping a single copy of the short strings repeated across its records."""
+    strings = {}
+
+    def compact(pairs):
+        return dict((key, strings.setdefault(value, value) if isinstance(value, str) and len(value) <= SHARED_STRING_MAX_LENGTH
+                     else value) for key, value in pairs)
+
+    return json.loads(content, object_pairs_hook=compact)
+
+
+class CallStats(object):
+    """
+    Counts the REST calls made through the pyCSM clients and the bytes they transferred.
+
+    bytes_received is the size of the response bodies on the wire and bytes_decoded their size
+    after the gzip or deflate content encoding negotiated by requests was removed.  peak_rss_bytes
+    is the peak resident memory of the module process when the statistics are read.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.calls = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.content_encodings = {}
+        self.queued_seconds = 0.0
+        self.queued_calls = []
+
+    def record_queued(self, name, seconds):
+        with self.lock:
+            self.queued_seconds += seconds
+            if seconds >= 0.001:
+                self.queued_calls.append({'call': name, 'seconds': round(seconds, 3)})
+
+    def record_login(self):
+        with self.lock:
+            self.logins += 1
+
+    def record(self, response):
+        headers = getattr(response, 'headers', None)
+        if headers is None:
+            return
+        decoded = len(response.content or b'')
+        raw = getattr(response, 'raw', None)
+        try:
+            received = int(raw.tell())
+        except (AttributeError, TypeError, ValueError):
+            received = decoded
+        encoding = headers.get('Content-Encoding', 'identity')
+        with self.lock:
+            self.calls += 1
+            self.bytes_received += received
+            self.bytes_decoded += decoded
+            self.content_encodings[encoding] = self.content_encodings.get(encoding, 0) + 1
+
+    def as_dict(self):
+        with self.lock:
+            return dict(logins=self.logins, calls=self.calls, bytes_received=self.bytes_received, bytes_decoded=self.bytes_decoded,
+                        content_encodings=dict(self.content_encodings), queued_seconds=round(self.queued_seconds, 3),
+                        queued_calls=list(self.queued_calls), peak_rss_bytes=peak_rss_bytes())
+
+
+@contextmanager
+def limited_call(rate_limiter, call_stats, name):
+    """Hold a call to the server until the rate limiter allows it and record how long it was queued."""
+    if rate_limiter is None:
+        yield
+        return
+    call_stats.record_queued(name, rate_limiter.acquire())
+    try:
+        yield
+    finally:
+        rate_limiter.release()
+
+
+class _CompactResponse(object):
+    """A response whose json() is parsed with decode_json."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def json(self):
+        return decode_json(self._response.content)
+
+
+class _InstrumentedClient(object):
+    """Wraps a pyCSM client and records every response it returns in a CallStats."""
+
+    def __init__(self, client, call_stats, rate_limiter=None, compact_responses=False):
+        self._client = client
+        self._call_stats = call_stats
+        self._rate_limiter = rate_limiter
+        self._compact_responses = compact_responses
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with limited_call(self._rate_limiter, self._call_stats, name):
+                response = attribute(*args, **kwargs)
+            self._call_stats.record(response)
+            if self._compact_responses and getattr(response, 'headers', None) is not None:
+                return _CompactResponse(response)
+            return response
+
+        return call
+
 
 @six.add_metaclass(abc.ABCMeta)
 class CSMClientBase(object):
+    # Parse the responses with decode_json, for modules returning large lists of records
+    compact_responses = False
+
     def __init__(self, module):
 
-        if not HAS_PYCSM:
+        if module.params['record_dir'] and module.params['replay_dir']:
+            module.fail_json(msg="record_dir and replay_dir are mutually exclusive.")
+        # Replaying needs no server, nor the pyCSM clients
+        if not HAS_PYCSM and not module.params['replay_dir']:
             module.fail_json(msg=missing_required_lib('pyCSM'), exception=PYCSM_IMP_ERR)
 
         self.module = module
@@ -48,36 +205,198 @@ class CSMClientBase(object):
         self.password = module.params['password']
         self.port = module.params['port']
         self.call_properties = module.params['call_properties']
+        self.call_stats = CallStats()
+        self.rate_limiter = RateLimiter.for_server(module.params['call_lock_dir'] or tempfile.gettempdir(), self.hostname, self.port,
+                                                   module.params['max_calls_per_second'], module.params['max_concurrent_calls'])
+        self.fixtures = None
+        if module.params['record_dir'] or module.params['replay_dir']:
+            self.fixtures = FixtureStore(module.params['record_dir'] or module.params['replay_dir'], [self.password],
+                                         module.params['replay_latency'])
 
-        self.session_client = self.connect_to_session_api()
-        self.hardware_client = self.connect_to_hw_api()
-        self.system_client = self.connect_to_system_api()
+        # Each client logs in to the server when it is first used, so a module only pays for the clients it needs.
+        self._client_lock = threading.Lock()
+        self._session_client = None
+        self._hardware_client = None
+        self._system_client = None
         self.changed = False
         self.failed = False
 
-    def connect_to_session_api(self):
+    @property
+    def session_client(self):
+        with self._client_lock:
+            if self._session_client is None:
+                self._session_client = self.connect_to_session_api()
+        return self._session_client
 
-        session_client = sessionClient(server_address=self.hostname, server_port=self.port, username=self.username,
-                                       password=self.password)
-        session_client.change_properties(self.call_properties)
+    @property
+    def hardware_client(self):
+        with self._client_lock:
+            if self._hardware_client is None:
+                self._hardware_client = self.connect_to_hw_api()
+        return self._hardware_client
 
-        return session_client
+    @property
+    def system_client(self):
+        with self._client_lock:
+            if self._system_client is None:
+                self._system_client = self.connect_to_system_api()
+        return self._system_client
 
-    def connect_to_hw_api(self):
+    def _connect(self, kind, client_module, client_class):
+        if self.params['replay_dir']:
+            return _InstrumentedClient(ReplayClient(kind, self.fixtures, self.hostname, self.port), self.call_stats,
+                                       self.rate_limiter, self.compact_responses)
 
-        hw_client = hardwareClient(server_address=self.hostname, server_port=self.port, username=self.username,
-                                   password=self.password)
-        hw_client.change_properties(self.call_properties)
+        client_class = getattr(importlib.import_module(client_module), client_class)
+        start = time.time()
+        with limited_call(self.rate_limiter, self.call_stats, 'login'):
+            client = client_class(server_address=self.hostname, server_port=self.port, username=self.username,
+                                  password=self.password)
+        self.call_stats.record_login()
+        client.change_properties(self.call_properties)
 
-        return hw_client
+        if self.params['record_dir']:
+            self.fixtures.record(kind, LOGIN, (), {}, None, time.time() - start)
+            client = RecordingClient(client, kind, self.fixtures)
+        return _InstrumentedClient(client, self.call_stats, self.rate_limiter, self.compact_responses)
+
+    def connect_to_session_api(self):
+        return self._connect('session', 'pyCSM.clients.session_client', 'sessionClient')
+
+    def connect_to_hw_api(self):
+        return self._connect('hardware', 'pyCSM.clients.hardware_client', 'hardwareClient')
 
     def connect_to_system_api(self):
+        return self._connect('system', 'pyCSM.clients.system_client', 'systemClient')
+
+    def set_session_options(self, name, options):
+        headers = {"Accept-Language": self.call_properties.get('language', 'en-US'),
+                   "Content-Type": "application/x-www-form-urlencoded"}
+        return self.system_client.rest_put(self.system_client.base_url + SESSION_OPTIONS_RESOURCE.format(name=name),
+                                           options, headers)
+
+
+def unwrap_list(data, keys=('data', 'volumes', 'results')):
+    """Return the list of records of a server result that may be wrapped in a dictionary."""
+    while isinstance(data, dict):
+        for key in keys:
+            if key in data:
+                data = data[key]
+                break
+        else:
+            return [data]
+    return data if data is not None else []
+
+
+def volume_field(volume, keys):
+    """Return the first value found in the volume record for the given keys."""
+    for key in keys:
+        value = volume.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def option_value(value):
+    """Return a session option value in the string form the server reports it."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return to_native(value)
+
+
+def normalize_session_options(data):
+    """Return the result of get_session_options as a dictionary of option name to value."""
+    if isinstance(data, dict) and isinstance(data.get('data'), dict):
+        data = data['data']
+    if isinstance(data, dict) and isinstance(data.get('options'), (dict, list)):
+        data = data['options']
+    if isinstance(data, list):
+        # Options may come back as a list of name and value records.
+        return dict((option.get('name'), option.get('value')) for option in data if isinstance(option, dict))
+    if not isinstance(data, dict):
+        return {}
+    # or keyed by name, each holding its value with a description of the option
+    return dict((key, value.get('value') if isinstance(value, dict) and 'value' in value else value) for key, value in data.items())
+
+
+def diff_session_options(current, desired):
+    """Return the desired options whose value differs from the current one, as option name to before and after."""
+    diff = {}
+    for key, value in desired.items():
+        before = option_value(current[key]) if current.get(key) is not None else None
+        if before != option_value(value):
+            diff[key] = {'before': before, 'after': option_value(value)}
+    return diff
+
+
+def run_concurrently(function, items, max_workers, timeout=None):
+    """
+    Call the function on each item from at most max_workers daemon threads.
+
+    Return one (result, error) pair per item, in the order of the items.  An exception raised for
+    one item is returned as its error and does not stop the others.  With a timeout, an item whose
+    call has not returned timeout seconds after it started gets a timeout error, and its thread is
+    left behind so that the next item can start.
+    """
+    lock = threading.Lock()
+    slots = threading.Semaphore(max(1, max_workers))
+    results = [None] * len(items)
+    started = [None] * len(items)
+    finished = [threading.Event() for item in items]
+    abandoned = set()
+
+    def worker(index, item):
+        slots.acquire()
+        with lock:
+            started[index] = time.time()
+        try:
+            result = function(item), None
+        except Exception as e:
+            result = None, to_native(e)
+        with lock:
+            if index in abandoned:
+                return
+            results[index] = result
+            finished[index].set()
+        slots.release()
+
+    for index, item in enumerate(items):
+        thread = threading.Thread(target=worker, args=(index, item))
+        thread.daemon = True
+        thread.start()
+
+    for index in range(len(items)):
+        while not finished[index].wait(None if timeout is None else 0.1):
+            with lock:
+                if started[index] is not None and time.time() - started[index] > timeout and not finished[index].is_set():
+                    abandoned.add(index)
+                    results[index] = None, "Timed out after {0} seconds.".format(timeout)
+                    finished[index].set()
+                    slots.release()
+    return results
+
 
-        system_client = systemClient(server_address=self.hostname, server_port=self.port, username=self.username,
-                                     password=self.password)
-        system_client.change_properties(self.call_properties)
+def to_columnar(data):
+    """
+    Return the data with every list of dictionaries replaced by a dictionary of the column names
+    and one list of values per record, in the order of the column names.
 
-        return system_client
+    Each record is released from the list as soon as its row is built, so the records and the rows
+    are not both held in memory.
+    """
+    if isinstance(data, dict):
+        return dict((key, to_columnar(value)) for key, value in data.items())
+    if isinstance(data, list) and data and all(isinstance(record, dict) for record in data):
+        columns = {}
+        for record in data:
+            for key in record:
+                columns.setdefault(key, len(columns))
+        rows = []
+        for index, record in enumerate(data):
+            rows.append([record.get(key) for key in columns])
+            data[index] = None
+        return {'columns': list(columns), 'rows': rows}
+    return data
 
 
 def csm_argument_spec():
@@ -86,5 +405,11 @@ def csm_argument_spec():
         username=dict(type='str', required=True),
         password=dict(type='str', no_log=True, required=True),
         port=dict(type='int', required=False, default=9559),
-        call_properties=dict(type='dict', required=False, default=properties)
+        call_properties=dict(type='dict', required=False, default=properties),
+        max_calls_per_second=dict(type='float', required=False, fallback=(env_fallback, ['CSM_MAX_CALLS_PER_SECOND'])),
+        max_concurrent_calls=dict(type='int', required=False, fallback=(env_fallback, ['CSM_MAX_CONCURRENT_CALLS'])),
+        call_lock_dir=dict(type='path', required=False, fallback=(env_fallback, ['CSM_CALL_LOCK_DIR'])),
+        record_dir=dict(type='path', required=False, fallback=(env_fallback, ['CSM_RECORD_DIR'])),
+        replay_dir=dict(type='path', required=False, fallback=(env_fallback, ['CSM_REPLAY_DIR'])),
+        replay_latency=dict(type='float', required=False, default=1.0, fallback=(env_fallback, ['CSM_REPLAY_LATENCY']))
     )
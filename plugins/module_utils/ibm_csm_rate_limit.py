@@ -0,0 +1,112 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''Limits on the calls made to a CSM server, shared by every module process on the node.'''
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# The longest sleep between two checks of the shared state, so a freed slot is noticed quickly.
+MAX_POLL_INTERVAL = 0.25
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class RateLimiter(object):
+    """
+    A token bucket and a limit on the calls in flight for one CSM server.
+
+    The state is kept in a file locked with flock, so the forks of a playbook run and any other
+    module process on the node share it.  Calls in flight are recorded by process ID, so the slots
+    of a process that died are reclaimed.
+    """
+
+    def __init__(self, path, calls_per_second=None, max_concurrent_calls=None):
+        self.path = path
+        self.calls_per_second = calls_per_second
+        self.max_concurrent_calls = max_concurrent_calls
+
+    @classmethod
+    def for_server(cls, lock_dir, hostname, port, calls_per_second=None, max_concurrent_calls=None):
+        if not HAS_FCNTL or not (calls_per_second or max_concurrent_calls):
+            return None
+        os.makedirs(lock_dir, 0o700, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', '{0}_{1}'.format(hostname, port))
+        return cls(os.path.join(lock_dir, name + '.json'), calls_per_second, max_concurrent_calls)
+
+    @contextmanager
+    def _state(self):
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                state = json.loads(content) if content else {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _try_acquire(self, state, now):
+        """Take a token and a slot when both are free, otherwise return the seconds to wait."""
+        in_flight = [pid for pid in state.get('in_flight', []) if _is_alive(pid)]
+        state['in_flight'] = in_flight
+        wait = 0
+
+        if self.calls_per_second:
+            burst = max(1.0, self.calls_per_second)
+            tokens = min(burst, state.get('tokens', burst) + (now - state.get('updated', now)) * self.calls_per_second)
+            state['tokens'] = tokens
+            state['updated'] = now
+            if tokens < 1:
+                wait = (1 - tokens) / self.calls_per_second
+
+        if self.max_concurrent_calls and len(in_flight) >= self.max_concurrent_calls:
+            wait = max(wait, MAX_POLL_INTERVAL)
+
+        if wait == 0:
+            if self.calls_per_second:
+                state['tokens'] -= 1
+            in_flight.append(os.getpid())
+        return wait
+
+    def acquire(self):
+        """Wait for the call to be allowed and return the number of seconds it waited."""
+        start = time.time()
+        while True:
+            with self._state() as state:
+                wait = self._try_acquire(state, time.time())
+            if wait == 0:
+                return time.time() - start
+            time.sleep(min(wait, MAX_POLL_INTERVAL))
+
+    def release(self):
+        with self._state() as state:
+            in_flight = state.get('in_flight', [])
+            if os.getpid() in in_flight:
+                in_flight.remove(os.getpid())
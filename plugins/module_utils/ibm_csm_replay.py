@@ -0,0 +1,210 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''Responses of the CSM server recorded to fixture files, and replayed from them without a server.'''
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Keys whose values are replaced in the recorded arguments and responses
+SECRET_KEYS = re.compile(r'pass(word|wd)?|secret|token|^tk$|authorization|cookie|cert', re.IGNORECASE)
+SCRUBBED = '********'
+MIN_SECRET_LENGTH = 4
+# Stands for the base URL of the client in the recorded arguments, so a fixture replays against any server
+BASE_URL = '{base_url}'
+LOGIN = '__login__'
+
+
+class ReplayError(Exception):
+    pass
+
+
+def scrub(value, secrets=()):
+    """Return the value with the values of secret keys and the given secret strings replaced."""
+    if isinstance(value, dict):
+        return dict((key, SCRUBBED if SECRET_KEYS.search(str(key)) else scrub(item, secrets)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [scrub(item, secrets) for item in value]
+    if isinstance(value, str):
+        for secret in secrets:
+            value = value.replace(secret, SCRUBBED)
+    return value
+
+
+def _without_secrets(value):
+    """Return the value without the secret keys, which the client may add to its arguments, such as its token."""
+    if isinstance(value, dict):
+        return dict((key, _without_secrets(item)) for key, item in value.items() if not SECRET_KEYS.search(str(key)))
+    if isinstance(value, list):
+        return [_without_secrets(item) for item in value]
+    return value
+
+
+def _scrub_body(content, secrets):
+    text = content.decode('utf-8', 'replace') if isinstance(content, bytes) else (content or '')
+    try:
+        return json.dumps(scrub(json.loads(text), secrets))
+    except ValueError:
+        return scrub(text, secrets)
+
+
+class ReplayResponse(object):
+    """The parts of a requests response that the modules use, built from a recorded response."""
+
+    def __init__(self, recorded):
+        self.status_code = recorded['status_code']
+        self.headers = recorded['headers']
+        self.text = recorded['body']
+        self.content = self.text.encode('utf-8')
+        self.ok = self.status_code < 400
+        self.raw = None
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FixtureStore(object):
+    """
+    A directory of fixture files, one per client call and set of arguments, each holding the responses
+    to that call in the order they were recorded.
+
+    Recording appends to the files under a flock, so the forks of a playbook run can record into the
+    same directory.  Replaying serves the responses of a call in order within a module run and repeats
+    the last one, so polling loops replay the states they went through.
+    """
+
+    def __init__(self, path, secrets=(), latency=1.0):
+        self.path = path
+        # Short secrets are not replaced in the text, they would match too much of it
+        self.secrets = [secret for secret in secrets if secret and len(secret) >= MIN_SECRET_LENGTH]
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.positions = {}
+
+    def _file(self, kind, name, args, kwargs, base_url):
+        text = json.dumps([list(args), kwargs], default=str)
+        if base_url:
+            text = text.replace(base_url, BASE_URL)
+        call = json.loads(text)
+        # The secret keys are left out of the key, so a call matches whether or not they were set
+        digest = hashlib.sha1(json.dumps([kind, name, scrub(_without_secrets(call), self.secrets)],
+                                         sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        call = scrub(call, self.secrets)
+        return os.path.join(self.path, '{0}.{1}.{2}.json'.format(kind, name, digest)), call
+
+    @contextmanager
+    def _locked(self, path):
+        with open(path, 'a+') as f:
+            if HAS_FCNTL:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                yield f, json.loads(content) if content else None
+            finally:
+                if HAS_FCNTL:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def record(self, kind, name, args, kwargs, response, elapsed, base_url=None):
+        os.makedirs(self.path, 0o700, exist_ok=True)
+        path, call = self._file(kind, name, args, kwargs, base_url)
+        recorded = {'elapsed': round(elapsed, 6)}
+        if response is not None:
+            headers = getattr(response, 'headers', None) or {}
+            recorded.update(status_code=getattr(response, 'status_code', 200),
+                            # The body is stored decoded, so the content encoding no longer applies
+                            headers=dict((key, value) for key, value in headers.items()
+                                         if key.lower() not in ('content-encoding', 'content-length', 'set-cookie')
+                                         and not SECRET_KEYS.search(key)),
+                            body=_scrub_body(getattr(response, 'content', b''), self.secrets))
+        with self.lock:
+            with self._locked(path) as (f, fixture):
+                fixture = fixture or {'kind': kind, 'name': name, 'args': call[0], 'kwargs': call[1], 'responses': []}
+                fixture['responses'].append(recorded)
+                f.seek(0)
+                f.truncate()
+                json.dump(fixture, f, indent=1)
+                f.flush()
+
+    def replay(self, kind, name, args, kwargs, base_url=None):
+        path, call = self._file(kind, name, args, kwargs, base_url)
+        if not os.path.exists(path):
+            if name == LOGIN:
+                return None
+            raise ReplayError("No recorded response for the {kind} call {name} with the arguments {call} in {path}.".format(
+                kind=kind, name=name, call=json.dumps(call), path=self.path))
+        with open(path, 'r') as f:
+            responses = json.load(f)['responses']
+        with self.lock:
+            position = self.positions.get(path, 0)
+            self.positions[path] = position + 1
+        recorded = responses[min(position, len(responses) - 1)]
+        if self.latency:
+            time.sleep(recorded['elapsed'] * self.latency)
+        return ReplayResponse(recorded) if 'body' in recorded else None
+
+
+class RecordingClient(object):
+    """Wraps a pyCSM client and records every call it makes in a FixtureStore."""
+
+    def __init__(self, client, kind, store):
+        self._client = client
+        self._kind = kind
+        self._store = store
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            # The arguments are recorded as given: the pyCSM rest_* calls add the token to the headers passed to them
+            recorded_args, recorded_kwargs = copy.deepcopy((args, kwargs))
+            start = time.time()
+            response = attribute(*args, **kwargs)
+            self._store.record(self._kind, name, recorded_args, recorded_kwargs, response, time.time() - start,
+                               getattr(self._client, 'base_url', None))
+            return response
+
+        return call
+
+
+class ReplayClient(object):
+    """Stands for a pyCSM client and answers its calls from a FixtureStore."""
+
+    def __init__(self, kind, store, hostname, port):
+        self._kind = kind
+        self._store = store
+        self.base_url = 'https://{0}:{1}/CSM/web'.format(hostname, port)
+        self.tk = SCRUBBED
+        # The login latency is replayed too
+        store.replay(kind, LOGIN, (), {})
+
+    def change_properties(self, properties):
+        return properties
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self._store.replay(self._kind, name, args, kwargs, self.base_url)
+
+        return call
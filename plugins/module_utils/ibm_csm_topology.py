@@ -0,0 +1,97 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''The volumes of the copysets of sessions by role, joined with the volumes of the storage systems.'''
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+from ansible.module_utils._text import to_native
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import volume_field, VOLUME_ID_KEYS, VOLUME_NAME_KEYS, \
+    VOLUME_WWN_KEYS
+
+COPYSET_LIST_KEYS = ('copysets', 'results', 'data')
+COPYSET_ID_KEYS = ('copysetID', 'copysetId', 'id', 'name')
+COPYSET_VOLUME_KEYS = ('volumes', 'roles', 'roleVolumes')
+ROLE_KEYS = ('role', 'roleName', 'rolename')
+ROLE_VOLUME_ID_KEYS = ('volumeId', 'volumeID', 'elementId', 'volume', 'id')
+# Roles are named by a letter and a number, such as H1, I2 or J3
+ROLE_NAME = re.compile(r'^[A-Z]\d+$')
+VOLUME_ELEMENT = 'VOL'
+
+
+def volume_system(volume_id):
+    """
+    Return the storage system name in a volume ID, found before VOL on a DS8000 (DS8000:2107.KTLM1:VOL:0001)
+    and after it on the SVC based systems (FlashSystem:VOL:lbsfs5200A:12), or None.
+    """
+    parts = to_native(volume_id).split(':')
+    if VOLUME_ELEMENT not in parts:
+        return None
+    position = parts.index(VOLUME_ELEMENT)
+    if position > 1:
+        return parts[position - 1]
+    return parts[position + 1] if position + 2 < len(parts) else None
+
+
+def _role_volume(role, volume):
+    if isinstance(volume, dict):
+        return role or volume_field(volume, ROLE_KEYS), volume_field(volume, ROLE_VOLUME_ID_KEYS)
+    return role, volume
+
+
+def copyset_volumes(copyset):
+    """Return the (role, volume ID) pairs of a copyset record, with a role of None when the record has none."""
+    if not isinstance(copyset, dict):
+        return [(None, to_native(copyset))] if copyset else []
+    volumes = volume_field(copyset, COPYSET_VOLUME_KEYS)
+    if isinstance(volumes, dict):
+        pairs = [_role_volume(role, volume) for role, volume in volumes.items()]
+    elif isinstance(volumes, list):
+        pairs = [_role_volume(None, volume) for volume in volumes]
+    else:
+        # The volumes may be held in keys named after their roles, or the copyset known by its ID alone,
+        # which is the ID of its first volume.
+        pairs = [(key, value) for key, value in copyset.items() if ROLE_NAME.match(key) and isinstance(value, str)]
+        if not pairs and volume_field(copyset, COPYSET_ID_KEYS):
+            pairs = [(None, volume_field(copyset, COPYSET_ID_KEYS))]
+    return [(role, to_native(volume)) for role, volume in pairs if volume]
+
+
+class VolumeIndex(object):
+    """
+    The volumes of storage systems in a dictionary keyed by volume ID.  Only the fields of the topology
+    are kept, so the volume lists of the storage systems can be released as soon as they are indexed.
+    """
+
+    def __init__(self):
+        self.volumes = {}
+
+    def add(self, system_name, volumes):
+        for volume in volumes:
+            volume_id = volume_field(volume, VOLUME_ID_KEYS) if isinstance(volume, dict) else None
+            if volume_id:
+                self.volumes[to_native(volume_id).upper()] = (system_name, volume_field(volume, VOLUME_NAME_KEYS),
+                                                              volume_field(volume, VOLUME_WWN_KEYS))
+
+    def get(self, volume_id):
+        return self.volumes.get(volume_id.upper())
+
+
+def session_topology(copysets, index):
+    """
+    Return one record per volume of the copysets of each session, with the session, copyset, role, volume ID,
+    volume name, storage system and WWN.  A volume missing from the index keeps the storage system of its ID.
+    """
+    records = []
+    for session in sorted(copysets):
+        for copyset in copysets[session]:
+            copyset_id = to_native(volume_field(copyset, COPYSET_ID_KEYS) if isinstance(copyset, dict) else copyset)
+            for role, volume_id in copyset_volumes(copyset):
+                system_name, volume_name, wwn = index.get(volume_id) or (volume_system(volume_id), None, None)
+                records.append({'session': session, 'copyset': copyset_id, 'role': role, 'volume': volume_id,
+                                'volume_name': volume_name, 'storage_system': system_name, 'wwn': wwn})
+    return records
@@ -0,0 +1,101 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+'''On-disk catalog of the volumes of the storage systems managed by a CSM server.'''
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import time
+import traceback
+
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import volume_field, VOLUME_ID_KEYS, VOLUME_NAME_KEYS, VOLUME_WWN_KEYS
+
+SQLITE_IMP_ERR = None
+try:
+    import sqlite3
+
+    HAS_SQLITE = True
+except ImportError:
+    SQLITE_IMP_ERR = traceback.format_exc()
+    HAS_SQLITE = False
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS systems (server TEXT, system_name TEXT, fetched REAL, '
+    'PRIMARY KEY (server, system_name))',
+    'CREATE TABLE IF NOT EXISTS volumes (server TEXT, system_name TEXT, id TEXT, name TEXT, wwn TEXT, data TEXT)',
+    'CREATE INDEX IF NOT EXISTS volumes_id ON volumes (server, system_name, id)',
+    'CREATE INDEX IF NOT EXISTS volumes_name ON volumes (server, system_name, name)',
+    'CREATE INDEX IF NOT EXISTS volumes_wwn ON volumes (server, system_name, wwn)',
+)
+
+
+class VolumeCatalog(object):
+    """
+    Volume lists keyed by CSM server (host:port) and storage system name, stored in a SQLite database.
+
+    A storage system entry is fresh for ttl seconds after it was stored.  Lookups by volume
+    name, ID or WWN prefix are answered from the indexes without loading the whole list.
+    """
+
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path, timeout=30)
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def is_fresh(self, server, system_name):
+        row = self.connection.execute('SELECT fetched FROM systems WHERE server = ? AND system_name = ?',
+                                      (server, system_name)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl
+
+    def store(self, server, system_name, volumes):
+        rows = []
+        for volume in volumes:
+            wwn = volume_field(volume, VOLUME_WWN_KEYS)
+            rows.append((server, system_name, volume_field(volume, VOLUME_ID_KEYS), volume_field(volume, VOLUME_NAME_KEYS),
+                         wwn.upper() if wwn else None, json.dumps(volume, separators=(',', ':'))))
+        # The old volumes are deleted in the transaction of the new ones, so a reader never sees the system empty
+        with self.connection:
+            self._delete(server, system_name)
+            self.connection.executemany('INSERT INTO volumes VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self.connection.execute('INSERT INTO systems VALUES (?, ?, ?)', (server, system_name, time.time()))
+
+    def invalidate(self, server, system_name=None):
+        with self.connection:
+            self._delete(server, system_name)
+
+    def _delete(self, server, system_name):
+        where = 'server = ?'
+        args = (server,)
+        if system_name is not None:
+            where += ' AND system_name = ?'
+            args += (system_name,)
+        self.connection.execute('DELETE FROM volumes WHERE ' + where, args)
+        self.connection.execute('DELETE FROM systems WHERE ' + where, args)
+
+    def volumes(self, server, system_name):
+        cursor = self.connection.execute('SELECT data FROM volumes WHERE server = ? AND system_name = ?',
+                                         (server, system_name))
+        return [json.loads(row[0]) for row in cursor]
+
+    def lookup(self, server, system_name, values):
+        """Return the volumes whose ID or name equals, or whose WWN starts with, one of the values."""
+        found = {}
+        for value in values:
+            # A range scan on the wwn index matches the partial WWN as a prefix.
+            prefix = value.upper()
+            cursor = self.connection.execute(
+                'SELECT rowid, data FROM volumes WHERE server = ? AND system_name = ? AND id = ? '
+                'UNION SELECT rowid, data FROM volumes WHERE server = ? AND system_name = ? AND name = ? '
+                'UNION SELECT rowid, data FROM volumes WHERE server = ? AND system_name = ? AND wwn >= ? AND wwn < ?',
+                (server, system_name, value, server, system_name, value, server, system_name, prefix, prefix + u'\uffff'))
+            for rowid, data in cursor:
+                found.setdefault(rowid, data)
+        return [json.loads(found[rowid]) for rowid in sorted(found)]
+
+    def close(self):
+        self.connection.close()
@@ -101,7 +101,7 @@ class ActiveStandbyManager(CSMClientBase):
             result = self._takeover()
         elif self.params['action'] == 'remove':
             result = self._remove()
-        elif self.params['reconnect'] == 'reconnect':
+        elif self.params['action'] == 'reconnect':
             result = self._reconnect()
 
         json_result = result.json()
@@ -129,9 +129,9 @@ def main():
     try:
         result = active_standby_manager.perform_active_standby_action()
         if active_standby_manager.failed:
-            module.fail_json(changed=active_standby_manager.changed, result=result)
+            module.fail_json(changed=active_standby_manager.changed, result=result, call_stats=active_standby_manager.call_stats.as_dict())
         else:
-            module.exit_json(changed=active_standby_manager.changed, result=result)
+            module.exit_json(changed=active_standby_manager.changed, result=result, call_stats=active_standby_manager.call_stats.as_dict())
     except Exception as e:
         active_standby_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
 
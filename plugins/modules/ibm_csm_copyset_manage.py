@@ -38,8 +38,39 @@ options:
   copysets:
     description:
       - List of all copy sets in the session to be managed.  A copy set is a list of one or more volumes.
+      - Required when I(copysets_file) is not specified.
     type: str
-    required: true
+
+  copysets_file:
+    description:
+      - A file on the managed node listing the copy sets to be managed, one copy set per line.
+      - In CSV files each line holds the volumes of a copy set in the order of I(role_order).  In JSON Lines
+        files each line is a JSON list of the volumes.  Empty lines and lines starting with C(#) are skipped.
+      - When I(state=absent) only the first volume of each copy set is used.
+      - The file is read twice as a stream, first to validate every line and then to send the copy sets in
+        chunks of I(chunk_size), so neither the module arguments nor the memory used grow with the file.
+      - Mutually exclusive with I(copysets).
+    type: path
+    version_added: "1.1.0"
+
+  copysets_file_format:
+    description:
+      - The format of I(copysets_file).  C(auto) uses C(jsonl) for files ending in C(.jsonl) or C(.json)
+        and C(csv) otherwise.
+    type: str
+    default: auto
+    choices:
+      - auto
+      - csv
+      - jsonl
+    version_added: "1.1.0"
+
+  chunk_size:
+    description:
+      - The number of copy sets of I(copysets_file) sent to the server in one request.
+    type: int
+    default: 500
+    version_added: "1.1.0"
 
   force:
     description:
@@ -90,6 +121,17 @@ EXAMPLES = r'''
     state: 'absent'
     copysets: "['DS8000:2107.KTLM1:VOL:0001','DS8000:2107.GXZ91:VOL:D004']"
     force: True
+
+- name: Create the copy sets listed in a CSV file on the managed node
+  ibm.csm.ibm_csm_copyset_manage:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    name: 'mysessname'
+    state: 'present'
+    role_order: "['H1', 'H2']"
+    copysets_file: /var/tmp/migration_copysets.csv
+    chunk_size: 1000
 '''
 
 RETURN = r''' # '''
@@ -97,6 +139,7 @@ RETURN = r''' # '''
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, ABSENT, PRESENT
 from ansible.module_utils._text import to_native
+import csv
 import json
 
 
@@ -120,6 +163,83 @@ class CopysetManager(CSMClientBase):
 
         return json_result
 
+    def _copyset_file_format(self):
+        if self.params['copysets_file_format'] != 'auto':
+            return self.params['copysets_file_format']
+        return 'jsonl' if self.params['copysets_file'].lower().endswith(('.jsonl', '.json')) else 'csv'
+
+    @staticmethod
+    def _json_lines(f):
+        for line in f:
+            line = line.strip()
+            yield json.loads(line) if line and not line.startswith('#') else []
+
+    def _read_copysets_file(self):
+        """Yield the line number and volumes of each copy set of the file, failing on the first invalid line."""
+        path = self.params['copysets_file']
+        width = None
+        with open(path, 'r', newline='') as f:
+            lines = csv.reader(f) if self._copyset_file_format() == 'csv' else self._json_lines(f)
+            number = 0
+            while True:
+                number += 1
+                try:
+                    volumes = next(lines)
+                except StopIteration:
+                    return
+                except (ValueError, csv.Error) as e:
+                    self._handle_error("Invalid copy set on line {number} of {path}. Error [{error}].".format(
+                        number=number, path=path, error=to_native(e)))
+                if not volumes or (isinstance(volumes, list) and isinstance(volumes[0], str) and volumes[0].lstrip().startswith('#')):
+                    continue
+                if not isinstance(volumes, list) or not all(isinstance(volume, str) and volume.strip() for volume in volumes):
+                    self._handle_error("Invalid copy set on line {number} of {path}: a copy set must be a list of volume names."
+                                       .format(number=number, path=path))
+                volumes = [volume.strip() for volume in volumes]
+                if width is None:
+                    width = len(volumes)
+                elif len(volumes) != width and self.params['state'] == PRESENT:
+                    self._handle_error("Invalid copy set on line {number} of {path}: {count} volumes where the previous "
+                                       "copy sets have {width}.".format(number=number, path=path, count=len(volumes), width=width))
+                yield number, volumes
+
+    def _copysets_file_chunks(self):
+        chunk = []
+        for number, volumes in self._read_copysets_file():
+            chunk.append((number, volumes if self.params['state'] == PRESENT else volumes[0]))
+            if len(chunk) >= self.params['chunk_size']:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _manage_copysets_file(self):
+        count = sum(1 for copyset in self._read_copysets_file())
+        results = []
+        if self.module.check_mode or count == 0:
+            self.changed = count > 0
+            return {'copysets': count, 'chunks': results}
+
+        for chunk in self._copysets_file_chunks():
+            copysets = [copyset for number, copyset in chunk]
+            if self.params['state'] == PRESENT:
+                json_result = self.session_client.add_copysets(self.params['name'], copysets, self.params['role_order']).json()
+            else:
+                json_result = self.session_client.remove_copysets(self.params['name'], copysets,
+                                                                  self.params['force'], self.params['keeponhw']).json()
+            results.append({'first_line': chunk[0][0], 'last_line': chunk[-1][0], 'copysets': len(copysets),
+                            'msg': json_result.get('msg'), 'msgTranslated': json_result.get('msgTranslated')})
+            if json_result['msg'].endswith('E'):
+                self._handle_error("Failed to {action} the copy sets of lines {first} to {last} of {path}, {done} copy sets were "
+                                   "processed before. ERR: {error}".format(action='create' if self.params['state'] == PRESENT else 'delete',
+                                                                           first=chunk[0][0], last=chunk[-1][0],
+                                                                           path=self.params['copysets_file'],
+                                                                           done=sum(r['copysets'] for r in results[:-1]),
+                                                                           error=to_native(json_result['msgTranslated'])),
+                                   json_result)
+            self.changed = True
+        return {'copysets': count, 'chunks': results}
+
     def _delete_copysets(self):
         delete_result = self.session_client.remove_copysets(self.params['name'], self.params['copysets'],
                                                             self.params['force'], self.params['keeponhw'])
@@ -148,6 +268,9 @@ class CopysetManager(CSMClientBase):
         return json.dumps(result, indent=4)
 
     def manage_copysets(self):
+        if self.params['copysets_file'] is not None:
+            return self._manage_copysets_file()
+
         if self.params['state'] == PRESENT:
             return self._create_copysets()
 
@@ -160,12 +283,17 @@ def main():
     argument_spec.update(name=dict(type='str', required=True),
                          role_order=dict(type='str'),
                          state=dict(type='str', default=PRESENT, choices=[ABSENT, PRESENT]),
-                         copysets=dict(type='str', required=True),
+                         copysets=dict(type='str'),
+                         copysets_file=dict(type='path'),
+                         copysets_file_format=dict(type='str', default='auto', choices=['auto', 'csv', 'jsonl']),
+                         chunk_size=dict(type='int', default=500),
                          force=dict(type='bool', default=False),
                          keeponhw=dict(type='bool', default=False))
 
     module = AnsibleModule(
         argument_spec=argument_spec,
+        mutually_exclusive=[('copysets', 'copysets_file')],
+        required_one_of=[('copysets', 'copysets_file')],
         supports_check_mode=True,
     )
 
@@ -174,9 +302,9 @@ def main():
     try:
         result = copyset_manager.manage_copysets()
         if copyset_manager.failed:
-            module.fail_json(changed=copyset_manager.changed, result=result)
+            module.fail_json(changed=copyset_manager.changed, result=result, call_stats=copyset_manager.call_stats.as_dict())
         else:
-            module.exit_json(changed=copyset_manager.changed, result=result)
+            module.exit_json(changed=copyset_manager.changed, result=result, call_stats=copyset_manager.call_stats.as_dict())
     except Exception as e:
         copyset_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
 
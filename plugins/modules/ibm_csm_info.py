@@ -22,19 +22,67 @@ options:
     description:
       - The ID number of the backup. (example - 1659891600)
     type: int
+  backup_interval:
+    description:
+      - The number of seconds expected between two backups of a session, used by session_backup_analytics
+        to count the missed intervals.  Defaults to the median gap between the backups of each session.
+    type: int
+    version_added: "1.1.0"
+  coalesce:
+    description:
+      - Share the result of the query between the hosts of the play that run the task with the same options.
+      - The first host to run the query calls the server, the hosts running the same query in the same task
+        at the same time or within I(coalesce_ttl) seconds afterwards get its result, with C(coalesced) set to true.
+      - The result of a task is not shared with later tasks, and a host retrying the task in an C(until) loop
+        queries the server again.
+      - Coalescing is done on the controller and is never used with I(cursor_file), I(record_dir), I(volume_catalog)
+        or I(volume_catalog_invalidate), which keep state on each host.  Set it to C(false) when recording with
+        the C(CSM_RECORD_DIR) environment variable.
+    type: bool
+    default: true
+    version_added: "1.1.0"
+  coalesce_ttl:
+    description:
+      - The number of seconds the result of a query is shared after it completed.
+    type: int
+    default: 30
+    version_added: "1.1.0"
   count:
     description:
       - The number of messages to return.
+      - When a cursor is given with I(since) or I(cursor_file), this is the initial page size. The page
+        size is doubled until all events newer than the cursor are returned or I(max_count) is reached.
     type: int
     default: 10
+  cursor_file:
+    description:
+      - Path to a file on the managed node that stores the system_log_event_list cursor between runs.
+      - When the file exists and I(since) is not set, only events newer than the stored cursor are returned.
+      - The file is updated with the newest event returned unless the module runs in check mode.
+    type: path
+    version_added: "1.1.0"
   device_id:
     description:
       - The ID of the storage system. The cluster name on a FlashSystem. (example - lbsfs5200A)
-    type: str
+      - Several storage systems, or C(all) for the storage systems of device type C(svc),
+        are read concurrently and the result of hardware_svchosts_list is keyed by storage system.
+        With I(gather_error_fail=false), the errors of the storage systems that failed are returned in
+        C(gather_errors) keyed by storage system.
+    type: list
+    elements: str
   device_type:
     description:
       - The type of storage device (example - ds8000 or svc).
+      - Only used by hardware_device_list.
     type: str
+  from_time:
+    description:
+      - Limits session_recovered_backup_list and session_snapshot_clone_list to the backups taken at or after
+        this time, in seconds since the epoch. (example - 1659891600)
+      - Backup IDs are the backup times, so the matching backups are found with a binary search of the
+        sorted backup IDs and returned as a list of records, oldest first.
+    type: int
+    version_added: "1.1.0"
   gather_error_fail:
     default: true
     description:
@@ -52,6 +100,7 @@ options:
       - hardware_volume_list_by_wwn
       - hardware_volume_list_by_system
       - scheduled_task_list
+      - session_backup_analytics
       - session_backup_detail
       - session_command_list
       - session_detail
@@ -64,6 +113,7 @@ options:
       - session_snapshot_clone_detail
       - session_snapshot_clone_list
       - session_snapshot_detail
+      - session_topology
       - system_log_event_list
       - system_log_packages_list
       - system_session_supported_list
@@ -80,14 +130,20 @@ options:
       - hardware_device_list - Lists all the storagedevices of a given type.
                                The 'device_type' option is required.
       - hardware_path_list - List all logical paths on a given DS8000 storage system.
-                             The 'system_id' option will limit results to a single DS8000.
+                             The 'system_id' option will limit results to the given DS8000s.
       - hardware_svchosts_list - List the hosts defined on the SVC based storage system.
                                  The 'device_id' option is required.
-      - hardware_volume_list_by_wwn - List volumes for a given WWN.
+      - hardware_volume_list_by_wwn - List volumes for the given WWNs, keyed by WWN.
                                       The 'wwn_name' option is required.
       - hardware_volume_list_by_system - List volumes for a given storage system.
-                                         The 'system_name' option is required.
+                                         The 'system_name' option is required.  The 'volume_lookup'
+                                         option limits the result to the matching volumes.
       - scheduled_task_list - list of scheduled tasks defined on the server.
+      - session_backup_analytics - Retention summary of the recovered backups of the Safeguarded Copy
+                                   sessions, keyed by session.  Each summary holds the backup count,
+                                   the oldest and newest backup, the distribution of the gaps between
+                                   backups, the missed intervals and an RPO estimate, all in seconds.
+                                   The 'name' option limits it to one session.  Not part of 'all'.
       - session_backup_detail - Detailed information for a given backup in a session.
                                 The 'name', 'role' and 'backup_id' options are required.
       - session_command_list - List of available commands for a session based on the session
@@ -112,8 +168,16 @@ options:
                                       The 'name' option is required.
       - session_snapshot_detail - Detailed information for a given snapshot in a session.
                                   The 'name', 'role' and 'snapshot' options are required.
+      - session_topology - One record per volume of the copysets of every session, with the session,
+                           copyset, role, volume ID, volume name, storage system and WWN.  The copysets
+                           of the sessions and then the volumes of their storage systems are read
+                           concurrently, and joined on the volume ID.  The 'name' option limits it to one
+                           session, and the volumes are read from I(volume_catalog) when it is set.
+                           Not part of 'all'.
       - system_log_event_list - List the most recent log events.
                                 The 'count' option is required.  The 'name' option is optional.
+                                The 'since' or 'cursor_file' options return only the events newer
+                                than the cursor.
       - system_log_packages_list - List the log packages and their location on the server.
       - system_session_supported_list - List the supported session types.
       - system_version_list - The version of the server being called.
@@ -121,10 +185,43 @@ options:
       - system_active_standby_status - Detailed status for active and standby server connection.
     elements: str
     type: list
+  latest:
+    description:
+      - Only return the newest of the backups selected by I(from_time) and I(to_time).
+      - With I(to_time) alone, this is the newest backup taken before that time.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+  limit:
+    description:
+      - Only return the newest I(limit) backups selected by I(from_time) and I(to_time).
+    type: int
+    version_added: "1.1.0"
+  max_count:
+    description:
+      - The largest page size used for system_log_event_list when catching up to a cursor.
+    type: int
+    default: 1000
+    version_added: "1.1.0"
   name:
     description:
       - The name of the session. (example - SGC_DB2_LBSFS5200A)
     type: str
+  output_format:
+    description:
+      - The format of the lists of records returned by the subsets.
+      - records - each list is returned as a list of dictionaries.
+      - columnar - each list of dictionaries is returned as a dictionary with the C(columns) key holding the
+        field names and the C(rows) key holding one list of values per record. Use the
+        C(ibm.csm.csm_records) filter to turn the result back into records.
+      - Each subset is turned to columns as soon as it is read, so C(columnar) holds a much smaller copy of
+        large lists such as hardware_volume_list_by_system in memory.
+    type: str
+    choices:
+      - records
+      - columnar
+    default: records
+    version_added: "1.1.0"
   role:
     description:
       - The name of the role where the backup or snapshot resides. (example - H1 or H2)
@@ -132,7 +229,52 @@ options:
   rolepair:
     description:
       - The name of the role pair. (example - H1-B1 or H1-R1)
+      - With C(all), copyset_pair_list and session_rolepair_list read the role pairs of the session from
+        the session detail and return the result of every role pair, read concurrently, keyed by role pair.
+        With I(gather_error_fail=false), the errors of the role pairs that failed are returned in
+        C(gather_errors) keyed by role pair.
+    type: str
+  server_timeout:
+    description:
+      - The number of seconds the subsets of one server in I(servers) may take before the server is reported as failed.
+    type: int
+    default: 300
+    version_added: "1.1.0"
+  servers:
+    description:
+      - Additional CSM servers to gather the subsets from, concurrently with I(hostname).
+      - When set, the results are returned in C(servers), a dictionary keyed by the server hostname holding
+        the subsets of each server.  The servers that fail are listed with their error in C(server_errors)
+        and do not stop the others.
+      - I(cursor_file) cannot be used with I(servers).
+    type: list
+    elements: dict
+    version_added: "1.1.0"
+    suboptions:
+      hostname:
+        description:
+          - The hostname of the CSM server.
+        type: str
+        required: true
+      username:
+        description:
+          - The username for the server.  Defaults to I(username).
+        type: str
+      password:
+        description:
+          - The password for the server.  Defaults to I(password).
+          - Use a vaulted variable to keep per-server credentials out of the playbook.
+        type: str
+      port:
+        description:
+          - The port of the server.  Defaults to I(port).
+        type: int
+  since:
+    description:
+      - Only return system_log_event_list events newer than this event timestamp. (example - 1666180800000)
+      - Overrides the cursor stored in I(cursor_file).
     type: str
+    version_added: "1.1.0"
   snapshot:
     description:
       - The name of the session snapshot.  (example - snapshot0)
@@ -140,15 +282,74 @@ options:
   system_id:
     description:
       - The ID of the DS8000 storage system. (example - 2107.DYR51)
-    type: str
+      - Several storage systems, or C(all) for the storage systems of device type C(ds8000),
+        are read concurrently and the result of hardware_path_list is keyed by storage system.
+        With I(gather_error_fail=false), the errors of the storage systems that failed are returned in
+        C(gather_errors) keyed by storage system.
+    type: list
+    elements: str
   system_name:
     description:
       - The name of the storage system. (example - 2107.DYR51 for DS8000 or lbsfs5200A for FlashSystem)
     type: str
+  to_time:
+    description:
+      - Limits session_recovered_backup_list and session_snapshot_clone_list to the backups taken at or before
+        this time, in seconds since the epoch.
+    type: int
+    version_added: "1.1.0"
+  volume_catalog:
+    description:
+      - Path to a SQLite database on the managed node that caches the volume lists of the storage systems.
+      - When set, hardware_volume_list_by_system, session_topology and the bulk WWN scan of hardware_volume_list_by_wwn
+        read the volumes of a storage system from the catalog while it is younger than I(volume_catalog_ttl).
+      - The volume list is returned as a list of volume records.
+    type: path
+    version_added: "1.1.0"
+  volume_catalog_invalidate:
+    description:
+      - Drop the cached volumes of I(system_name), or of every storage system of the server when
+        I(system_name) is not set, before the query runs.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+  volume_catalog_ttl:
+    description:
+      - The number of seconds the volume list of a storage system is served from I(volume_catalog).
+    type: int
+    default: 3600
+    version_added: "1.1.0"
+  volume_lookup:
+    description:
+      - List of volume names, volume IDs or partial WWNs. Limits hardware_volume_list_by_system to the
+        volumes that match one of them.
+      - With I(volume_catalog) the volumes are found through the catalog indexes.
+    type: list
+    elements: str
+    version_added: "1.1.0"
+  wwn_bulk_threshold:
+    description:
+      - When more WWNs than this are given in I(wwn_name), the volumes of each storage system in I(wwn_scan_systems)
+        are read once and the WWNs are resolved locally.
+      - Otherwise, or when I(wwn_scan_systems) is not set, each WWN is queried separately.
+    type: int
+    default: 50
+    version_added: "1.1.0"
   wwn_name:
     description:
       - The WWN, full or partial, to search for. (example - 6005076812810039f8000000000000)
-    type: str
+      - A list of WWNs can be given.  The volumes found are returned in a dictionary keyed by WWN.
+    type: list
+    elements: str
+  wwn_scan_systems:
+    description:
+      - The storage systems whose volumes are read to resolve more than I(wwn_bulk_threshold) WWNs,
+        or C(all) for the storage systems of device types C(ds8000) and C(svc).
+      - A WWN with no volume on these storage systems is queried separately, on every storage system of the server.
+        A partial WWN that matches volumes on these storage systems does not return the volumes it matches on others.
+    type: list
+    elements: str
+    version_added: "1.1.0"
 notes:
   - Supports C(check_mode).
 extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
@@ -209,6 +410,51 @@ EXAMPLES = r'''
     gather_subset: hardware_volume_list_by_wwn
     wwn_name: 6005076812810039f8000000000000
 
+- name: Resolve a list of WWNs with one volume scan of each storage system.
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: hardware_volume_list_by_wwn
+    wwn_scan_systems: lbsfs5200A
+    wwn_name: "{{ migration_wwns }}"
+
+- name: Retrieve the newest recovered backup taken before a given time.
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: session_recovered_backup_list
+    name: EXAMPLE_SESSION
+    to_time: 1659891600
+    latest: true
+
+- name: Summarize the backup retention of every Safeguarded Copy session taking hourly backups.
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: session_backup_analytics
+    backup_interval: 3600
+
+- name: List the role, storage system and WWN of every volume replicated by the sessions of the server.
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: session_topology
+    volume_catalog: ~/.ansible/csm_volumes.db
+  register: topology
+
+- name: Retrieve the pairs of every role pair of a Metro Global Mirror session.
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: copyset_pair_list
+    name: EXAMPLE_MGM_SESSION
+    rolepair: all
+
 - name: Retrieve snapshot and snapshot clone information for a session.
   ibm.csm.ibm_csm_info:
     hostname: "{{ csm_host }}"
@@ -228,17 +474,119 @@ EXAMPLES = r'''
     username: "{{ csm_username }}"
     password: "{{ csm_password }}"
     gather_subset: system_active_standby_status
+
+- name: Forward only the log events that were not returned by the previous run
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: system_log_event_list
+    cursor_file: /var/lib/csm/log_event_cursor.json
+
+- name: Gather the sessions and server status of several CSM servers in one task
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset:
+      - session_list
+      - system_volume_count_list
+      - system_active_standby_status
+    servers:
+      - hostname: csm-site2.example.com
+      - hostname: csm-site3.example.com
+        username: csm_site3_admin
+        password: "{{ vault_csm_site3_password }}"
+    server_timeout: 120
+
+- name: Gather the sessions once for all the hosts of the play
+  ibm.csm.ibm_csm_info:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    gather_subset: session_list_short
+    coalesce_ttl: 300
 '''
 
 RETURN = r''' # '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, run_concurrently, to_columnar, \
+    unwrap_list, volume_field, VOLUME_ID_KEYS, VOLUME_NAME_KEYS, VOLUME_WWN_KEYS
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_backups import filter_backups, summarize_backups
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_topology import session_topology, volume_system, copyset_volumes, \
+    VolumeIndex, COPYSET_LIST_KEYS
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_volume_catalog import VolumeCatalog, HAS_SQLITE, SQLITE_IMP_ERR
 from ansible.module_utils._text import to_native
+import bisect
 import json
+import os
+import re
+import tempfile
+
+SAFEGUARDED_SESSION_TYPE = re.compile(r'safeguard|sgc', re.IGNORECASE)
+
+ALL_ROLEPAIRS = 'all'
+FAN_OUT_MAX_WORKERS = 8
+ALL_SYSTEMS = 'all'
+DEVICE_NAME_KEYS = ('name', 'deviceName', 'id')
+SESSION_ROLEPAIR_KEYS = ('rolepairs', 'rolePairs', 'rolepairinfo')
+ROLEPAIR_NAME_KEYS = ('name', 'rolepair', 'rolePairName')
+# The results that are not the payload of a subset
+RESULT_METADATA_KEYS = ('call_stats', 'gather_errors', 'system_log_event_cursor')
+
+
+class ServerGatherError(Exception):
+    pass
+
+
+class _SubsetResults(dict):
+    """
+    The results of the subsets, each turned to the columnar format as soon as it is stored when
+    columnar is set, so the records of one subset at most are held in memory at a time.  The call
+    statistics, errors and cursors stored along with them keep their shape.
+    """
+
+    def __init__(self, columnar):
+        super(_SubsetResults, self).__init__()
+        self.columnar = columnar
+
+    def __setitem__(self, key, value):
+        columnar = self.columnar and key not in RESULT_METADATA_KEYS
+        super(_SubsetResults, self).__setitem__(key, to_columnar(value) if columnar else value)
+
+
+class _ServerModule(object):
+    """
+    The module as seen by the gatherer of one of the servers: the parameters hold the connection details
+    of that server, and a failure raises ServerGatherError instead of ending the module.
+    """
+
+    def __init__(self, module, server):
+        self._module = module
+        self.params = dict(module.params)
+        for key in ('hostname', 'username', 'password', 'port'):
+            if server.get(key) is not None:
+                self.params[key] = server[key]
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def fail_json(self, msg, **kwargs):
+        raise ServerGatherError(msg)
 
 
 class CSMGatherInfo(CSMClientBase):
+    compact_responses = True
+
+    def __init__(self, module):
+        super(CSMGatherInfo, self).__init__(module)
+        self.gather_errors = dict()
+        self.log_event_cursor = None
+        self.volume_catalog = None
+        # The servers on different ports of one host keep their own volumes in the catalog
+        self.catalog_server = '{0}:{1}'.format(self.hostname, self.port)
+        self.rolepairs = None
 
     def subset_opt_error(self, subset, option):
         error_msg = "Subset {0} failed.  Required parameters and values:".format(subset)
@@ -260,16 +608,45 @@ class CSMGatherInfo(CSMClientBase):
     def get_copyset_pair_list(self):
         kwargs = dict(name=self.params['name'],
                       rolepair=self.params['rolepair'])
+        if self.params['rolepair'] == ALL_ROLEPAIRS:
+            return self._for_each('copyset_pair_list', self._session_rolepairs(),
+                                  lambda rolepair: self.session_client.get_pair_info(name=self.params['name'], rolepair=rolepair).json())
         return self.session_client.get_pair_info(**kwargs).json()
 
+    def _session_rolepairs(self):
+        if self.rolepairs is None:
+            info = self.session_client.get_session_info(name=self.params['name']).json()
+            if isinstance(info, dict) and isinstance(info.get('data'), dict):
+                info = info['data']
+            rolepairs = volume_field(info, SESSION_ROLEPAIR_KEYS) if isinstance(info, dict) else None
+            self.rolepairs = [rolepair if not isinstance(rolepair, dict) else volume_field(rolepair, ROLEPAIR_NAME_KEYS)
+                              for rolepair in (rolepairs or [])]
+            self.rolepairs = [rolepair for rolepair in self.rolepairs if rolepair]
+        return self.rolepairs
+
+    def _for_each(self, subset, items, call):
+        """Call call for every item concurrently and return the results keyed by item, with the errors kept per item."""
+        results = run_concurrently(call, items, FAN_OUT_MAX_WORKERS)
+        merged = dict((item, result) for item, (result, error) in zip(items, results) if error is None)
+        errors = dict((item, error) for item, (result, error) in zip(items, results) if error is not None)
+        if errors:
+            if self.params['gather_error_fail']:
+                self.module.fail_json(msg="Subset {0} failed for {1}.".format(
+                    subset, ', '.join("{0} [{1}]".format(item, error) for item, error in sorted(errors.items()))))
+            self.gather_errors.setdefault(subset, {}).update(errors)
+        return merged
+
     def get_hardware_device_list(self):
         kwargs = dict(device_type=self.params['device_type'])
         return self.hardware_client.get_devices(**kwargs).json()
 
     def get_hardware_path_list(self):
         if self.module.params['system_id'] and len(self.module.params['system_id']) > 0:
+            if len(self.params['system_id']) > 1 or self.params['system_id'] == [ALL_SYSTEMS]:
+                return self._for_each('hardware_path_list', self._storage_systems('system_id', ('ds8000',)),
+                                      lambda system_id: self.hardware_client.get_path_on_storage_system(system_id=system_id).json())
             try:
-                kwargs = dict(system_id=self.params['system_id'])
+                kwargs = dict(system_id=self.params['system_id'][0])
                 return self.hardware_client.get_path_on_storage_system(**kwargs).json()
             except ValueError:
                 return self.subset_opt_error("hardware_path_list", kwargs)
@@ -277,20 +654,124 @@ class CSMGatherInfo(CSMClientBase):
             return self.hardware_client.get_paths().json()
 
     def get_hardware_svchosts_list(self):
-        kwargs = dict(device_id=self.params['device_id'])
+        if not self.params['device_id']:
+            return self.subset_opt_error("hardware_svchosts_list", dict(device_id=self.params['device_id']))
+        if len(self.params['device_id']) > 1 or self.params['device_id'] == [ALL_SYSTEMS]:
+            return self._for_each('hardware_svchosts_list', self._storage_systems('device_id', ('svc',)),
+                                  lambda device_id: self.hardware_client.get_svchosts(device_id=device_id).json())
+        kwargs = dict(device_id=self.params['device_id'][0])
         return self.hardware_client.get_svchosts(**kwargs).json()
 
+    def _storage_systems(self, option, device_types):
+        """
+        Return the storage systems of the option, expanding all to the storage systems of the device types
+        of the subset.  device_type is not used, as it may be set for hardware_device_list in the same task.
+        """
+        if self.params[option] != [ALL_SYSTEMS]:
+            return self.params[option]
+        names = []
+        for device_type in device_types:
+            for device in unwrap_list(self.hardware_client.get_devices(device_type=device_type).json()):
+                name = volume_field(device, DEVICE_NAME_KEYS) if isinstance(device, dict) else None
+                if name and name not in names:
+                    names.append(name)
+        return names
+
     def get_hardware_volume_list_by_system(self):
         kwargs = dict(system_name=self.params['system_name'])
-        return self.hardware_client.get_volumes(**kwargs).json()
+        lookup = self.params['volume_lookup']
+        catalog = self._volume_catalog()
+        if catalog is not None:
+            self._refresh_volume_catalog(catalog, kwargs['system_name'])
+            if lookup:
+                return catalog.lookup(self.catalog_server, kwargs['system_name'], lookup)
+            return catalog.volumes(self.catalog_server, kwargs['system_name'])
+
+        volumes = self.hardware_client.get_volumes(**kwargs).json()
+        if not lookup:
+            return volumes
+        wwn_prefixes = tuple(value.upper() for value in lookup)
+        return [volume for volume in unwrap_list(volumes)
+                if volume_field(volume, VOLUME_ID_KEYS) in lookup or volume_field(volume, VOLUME_NAME_KEYS) in lookup
+                or (volume_field(volume, VOLUME_WWN_KEYS) or '').upper().startswith(wwn_prefixes)]
+
+    def _volume_catalog(self):
+        if self.params['volume_catalog'] is None:
+            return None
+        if self.volume_catalog is None:
+            if not HAS_SQLITE:
+                self.module.fail_json(msg=missing_required_lib('sqlite3'), exception=SQLITE_IMP_ERR)
+            self.volume_catalog = VolumeCatalog(self.params['volume_catalog'], self.params['volume_catalog_ttl'])
+            if self.params['volume_catalog_invalidate']:
+                self.volume_catalog.invalidate(self.catalog_server, self.params['system_name'])
+        return self.volume_catalog
+
+    def _refresh_volume_catalog(self, catalog, system_name):
+        if not catalog.is_fresh(self.catalog_server, system_name):
+            catalog.store(self.catalog_server, system_name,
+                          unwrap_list(self.hardware_client.get_volumes(system_name=system_name).json()))
+
+    def _system_volumes(self, system_name):
+        catalog = self._volume_catalog()
+        if catalog is None:
+            return unwrap_list(self.hardware_client.get_volumes(system_name=system_name).json())
+        self._refresh_volume_catalog(catalog, system_name)
+        return catalog.volumes(self.catalog_server, system_name)
 
     def get_hardware_volume_list_by_wwn(self):
-        kwargs = dict(wwn_name=self.params['wwn_name'])
-        return self.hardware_client.get_volumes_by_wwn(**kwargs).json()
+        wwn_names = self.params['wwn_name']
+        if not wwn_names:
+            return self.subset_opt_error("hardware_volume_list_by_wwn", dict(wwn_name=wwn_names))
+
+        result = {}
+        if len(wwn_names) > self.params['wwn_bulk_threshold'] and self.params['wwn_scan_systems']:
+            result = self._scan_wwns(self._storage_systems('wwn_scan_systems', ('ds8000', 'svc')), wwn_names)
+        # The WWNs not found on the scanned storage systems are queried on every storage system of the server
+        unresolved = [wwn_name for wwn_name in wwn_names if not result.get(wwn_name)]
+        result.update(self._for_each('hardware_volume_list_by_wwn', unresolved,
+                                     lambda wwn_name: unwrap_list(self.hardware_client.get_volumes_by_wwn(wwn_name=wwn_name).json())))
+        return result
+
+    def _scan_wwns(self, system_names, wwn_names):
+        """Read each storage system once and answer every (partial) WWN from a sorted index."""
+        index = []
+        for system_name in system_names:
+            for volume in self._system_volumes(system_name):
+                wwn = volume_field(volume, VOLUME_WWN_KEYS)
+                if wwn:
+                    index.append((wwn.upper(), volume))
+        index.sort(key=lambda entry: entry[0])
+        keys = [entry[0] for entry in index]
+
+        result = {}
+        for wwn_name in wwn_names:
+            prefix = wwn_name.upper()
+            position = bisect.bisect_left(keys, prefix)
+            matches = []
+            while position < len(keys) and keys[position].startswith(prefix):
+                matches.append(index[position][1])
+                position += 1
+            result[wwn_name] = matches
+        return result
 
     def get_scheduled_task_list(self):
         return self.session_client.get_scheduled_tasks().json()
 
+    def get_session_backup_analytics(self):
+        if self.params['name']:
+            names = [self.params['name']]
+        else:
+            overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+            names = [overview.get('name') for overview in overviews
+                     if isinstance(overview, dict) and SAFEGUARDED_SESSION_TYPE.search(to_native(overview.get('type', '')))]
+
+        # The sessions are read one at a time and only their summary is kept, so one backup list is held at a time.
+        analytics = {}
+        for name in names:
+            analytics[name] = summarize_backups(self.session_client.get_recovered_backups(name=name).json(),
+                                                self.params['backup_interval'])
+        return analytics
+
     def get_session_backup_detail(self):
         kwargs = dict(name=self.params['name'],
                       role=self.params['role'],
@@ -321,6 +802,37 @@ class CSMGatherInfo(CSMClientBase):
         except ValueError:
             return self.subset_opt_error("session_option_list", kwargs)
 
+    def get_session_topology(self):
+        if self.params['name']:
+            names = [self.params['name']]
+        else:
+            overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+            names = [overview.get('name') for overview in overviews if isinstance(overview, dict) and overview.get('name')]
+
+        copysets = self._for_each('session_topology', names,
+                                  lambda name: unwrap_list(self.session_client.get_copysets(name=name).json(), keys=COPYSET_LIST_KEYS))
+        system_names = sorted(set(volume_system(volume_id) for session_copysets in copysets.values()
+                                  for copyset in session_copysets for role, volume_id in copyset_volumes(copyset)) - set([None]))
+        return session_topology(copysets, self._topology_volume_index(system_names))
+
+    def _topology_volume_index(self, system_names):
+        """Return the index by volume ID of the volumes of the storage systems, read concurrently unless cached."""
+        catalog = self._volume_catalog()
+        cached = [system_name for system_name in system_names if catalog is not None and catalog.is_fresh(self.catalog_server, system_name)]
+        volumes = self._for_each('session_topology', [system_name for system_name in system_names if system_name not in cached],
+                                 lambda system_name: unwrap_list(self.hardware_client.get_volumes(system_name=system_name).json()))
+
+        # The catalog is written from this thread only, its connection cannot be shared by the readers.
+        index = VolumeIndex()
+        for system_name in list(volumes):
+            system_volumes = volumes.pop(system_name)
+            if catalog is not None:
+                catalog.store(self.catalog_server, system_name, system_volumes)
+            index.add(system_name, system_volumes)
+        for system_name in cached:
+            index.add(system_name, catalog.volumes(self.catalog_server, system_name))
+        return index
+
     def get_session_recovered_backup_detail(self):
         kwargs = dict(name=self.params['name'],
                       backup_id=self.params['backup_id'])
@@ -328,12 +840,22 @@ class CSMGatherInfo(CSMClientBase):
 
     def get_session_recovered_backup_list(self):
         kwargs = dict(name=self.params['name'])
-        return self.session_client.get_recovered_backups(**kwargs).json()
+        return self._filter_backups(self.session_client.get_recovered_backups(**kwargs).json())
+
+    def _filter_backups(self, backups):
+        if self.params['from_time'] is None and self.params['to_time'] is None and not self.params['latest'] \
+                and self.params['limit'] is None:
+            return backups
+        return filter_backups(backups, self.params['from_time'], self.params['to_time'], self.params['latest'], self.params['limit'])
 
     def get_session_rolepair_list(self):
         kwargs = dict(name=self.params['name'],
                       rolepair=self.params['rolepair'])
         try:
+            if self.params['rolepair'] == ALL_ROLEPAIRS:
+                return self._for_each('session_rolepair_list', self._session_rolepairs(),
+                                      lambda rolepair: self.session_client.get_rolepair_info(name=self.params['name'],
+                                                                                             rolepair=rolepair).json())
             return self.session_client.get_rolepair_info(**kwargs).json()
         except ValueError:
             return self.subset_opt_error("session_rolepair_list", kwargs)
@@ -349,7 +871,7 @@ class CSMGatherInfo(CSMClientBase):
     def get_session_snapshot_clone_list(self):
         kwargs = dict(name=self.params['name'])
         try:
-            return self.session_client.get_snapshot_clones(**kwargs).json()
+            return self._filter_backups(self.session_client.get_snapshot_clones(**kwargs).json())
         except ValueError:
             return self.subset_opt_error("session_snapshot_clone_list", kwargs)
 
@@ -368,7 +890,97 @@ class CSMGatherInfo(CSMClientBase):
             kwargs['count'] = self.module.params['count']
         if self.module.params['name'] and len(self.module.params['name']) > 0:
             kwargs['session'] = self.module.params['name']
-        return self.system_client.get_log_events(**kwargs).json()
+
+        cursor = self._load_log_event_cursor()
+        if cursor is None:
+            return self.system_client.get_log_events(**kwargs).json()
+        if cursor['time'] is None:
+            # No cursor stored yet, start from the most recent events.
+            events = self.system_client.get_log_events(**kwargs).json()
+            self.log_event_cursor = self._next_log_event_cursor(events, cursor)
+            self._save_log_event_cursor(self.log_event_cursor)
+            return events
+
+        # Grow the page until it reaches back to the cursor, or the server has no older events.
+        count = kwargs.get('count', 10)
+        max_count = max(self.params['max_count'], count)
+        while True:
+            kwargs['count'] = count
+            events = self.system_client.get_log_events(**kwargs).json()
+            caught_up = len(events) < count or any(self._log_event_is_seen(event, cursor) for event in events)
+            if caught_up or count >= max_count:
+                break
+            count = min(count * 2, max_count)
+
+        if not caught_up:
+            self.module.warn("More than {0} log events were logged since the cursor. "
+                             "Older events were not returned.".format(max_count))
+
+        new_events = [event for event in events if not self._log_event_is_seen(event, cursor)]
+        self.log_event_cursor = self._next_log_event_cursor(new_events, cursor)
+        self._save_log_event_cursor(self.log_event_cursor)
+        return new_events
+
+    @staticmethod
+    def _log_event_time(event):
+        for key in ('time', 'timestamp'):
+            try:
+                return int(event[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return None
+
+    def _log_event_is_seen(self, event, cursor):
+        event_time = self._log_event_time(event)
+        if event_time is None or cursor['time'] is None:
+            return False
+        if event_time == cursor['time']:
+            return cursor['ids'] is None or event.get('id') in cursor['ids']
+        return event_time < cursor['time']
+
+    def _next_log_event_cursor(self, events, cursor):
+        for event in events:
+            event_time = self._log_event_time(event)
+            if event_time is None:
+                continue
+            if cursor['time'] is None or event_time > cursor['time']:
+                cursor = {'time': event_time, 'ids': []}
+            if event_time == cursor['time'] and event.get('id') not in cursor['ids']:
+                cursor['ids'].append(event.get('id'))
+        return cursor
+
+    def _load_log_event_cursor(self):
+        if self.params['since'] is not None:
+            try:
+                # Every event logged at the given timestamp counts as seen.
+                return {'time': int(self.params['since']), 'ids': None}
+            except ValueError:
+                self.module.fail_json(msg="The since option must be an event timestamp. "
+                                          "Got [{0}].".format(self.params['since']))
+
+        cursor_file = self.params['cursor_file']
+        if cursor_file is None:
+            return None
+        if not os.path.exists(cursor_file):
+            return {'time': None, 'ids': []}
+        try:
+            with open(cursor_file, 'r') as f:
+                cursor = json.load(f)
+            cursor_time = None if cursor['time'] is None else int(cursor['time'])
+            cursor_ids = cursor.get('ids')
+            return {'time': cursor_time, 'ids': None if cursor_ids is None else list(cursor_ids)}
+        except (IOError, OSError, ValueError, KeyError, TypeError) as e:
+            self.module.fail_json(msg="Failed to read the cursor file {0}. Error [{1}].".format(cursor_file, to_native(e)))
+
+    def _save_log_event_cursor(self, cursor):
+        cursor_file = self.params['cursor_file']
+        if cursor_file is None or self.module.check_mode:
+            return
+        directory = os.path.dirname(os.path.abspath(cursor_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.csm_cursor')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cursor, f)
+        self.module.atomic_move(tmp_path, cursor_file)
 
     def get_system_log_packages_list(self):
         return self.system_client.get_log_pkgs().json()
@@ -385,7 +997,7 @@ class CSMGatherInfo(CSMClientBase):
     def get_system_active_standby_status(self):
         return self.system_client.get_active_standby_status().json()
 
-    def run_query(self):
+    def collect(self):
 
         # Queries that do not require arguments
 
@@ -433,11 +1045,10 @@ class CSMGatherInfo(CSMClientBase):
             if self.module.params['system_name'] and len(self.module.params['system_name']) > 0:
                 subset.append('hardware_volume_list_by_system')
 
-            if self.module.params['wwn_name'] and len(self.module.params['wwn_name']) > 0:
+            if self.module.params['wwn_name']:
                 subset.append('hardware_volume_list_by_wwn')
 
-        query_result = {}
-        query_result['changed'] = False
+        query_result = _SubsetResults(self.params['output_format'] == 'columnar')
 
         if 'copyset_list' in subset:
             query_result['copyset_list'] = self.get_copyset_list()
@@ -455,6 +1066,8 @@ class CSMGatherInfo(CSMClientBase):
             query_result['hardware_volume_list_by_wwn'] = self.get_hardware_volume_list_by_wwn()
         if 'scheduled_task_list' in subset:
             query_result['scheduled_task_list'] = self.get_scheduled_task_list()
+        if 'session_backup_analytics' in subset:
+            query_result['session_backup_analytics'] = self.get_session_backup_analytics()
         if 'session_backup_detail' in subset:
             query_result['session_backup_detail'] = self.get_session_backup_detail()
         if 'session_command_list' in subset:
@@ -479,8 +1092,12 @@ class CSMGatherInfo(CSMClientBase):
             query_result['session_snapshot_clone_list'] = self.get_session_snapshot_clone_list()
         if 'session_snapshot_detail' in subset:
             query_result['session_snapshot_detail'] = self.get_session_snapshot_detail()
+        if 'session_topology' in subset:
+            query_result['session_topology'] = self.get_session_topology()
         if 'system_log_event_list' in subset:
             query_result['system_log_event_list'] = self.get_system_log_event_list()
+            if self.log_event_cursor is not None:
+                query_result['system_log_event_cursor'] = self.log_event_cursor
         if 'system_log_packages_list' in subset:
             query_result['system_log_packages_list'] = self.get_system_log_packages_list()
         if 'system_session_supported_list' in subset:
@@ -495,6 +1112,29 @@ class CSMGatherInfo(CSMClientBase):
         if not self.params['gather_error_fail']:
             query_result['gather_errors'] = json.loads(json.dumps(self.gather_errors))
 
+        query_result['call_stats'] = self.call_stats.as_dict()
+        return dict(query_result)
+
+    def _collect_server(self, server):
+        return CSMGatherInfo(_ServerModule(self.module, server)).collect()
+
+    def run_query(self):
+        if self.params['servers']:
+            servers = [{'hostname': self.hostname}] + self.params['servers']
+            results = run_concurrently(self._collect_server, servers, len(servers), timeout=self.params['server_timeout'])
+            query_result = {'servers': {}, 'server_errors': {}}
+            for server, (result, error) in zip(servers, results):
+                if error is not None:
+                    query_result['server_errors'][server['hostname']] = error
+                else:
+                    query_result['servers'][server['hostname']] = result
+        else:
+            query_result = self.collect()
+        query_result['changed'] = False
+
+        if self.params['servers'] and query_result['server_errors'] and self.params['gather_error_fail']:
+            self.module.fail_json(msg="Gathering failed on the servers {0}.".format(', '.join(query_result['server_errors'])),
+                                  **query_result)
         self.module.exit_json(**query_result)
 
 
@@ -502,9 +1142,14 @@ def main():
     argument_spec = csm_argument_spec()
     argument_spec.update(
         backup_id=dict(type='int'),
+        backup_interval=dict(type='int'),
+        coalesce=dict(type='bool', default=True),
+        coalesce_ttl=dict(type='int', default=30),
         count=dict(type='int', default=10),
-        device_id=dict(type='str'),
+        cursor_file=dict(type='path'),
+        device_id=dict(type='list', elements='str'),
         device_type=dict(type='str'),
+        from_time=dict(type='int'),
         gather_error_fail=dict(type='bool', required=False, default=True),
         gather_subset=dict(type='list', elements='str', required=False,
                            default=['all'],
@@ -517,6 +1162,7 @@ def main():
                                     'hardware_volume_list_by_wwn',
                                     'hardware_volume_list_by_system',
                                     'scheduled_task_list',
+                                    'session_backup_analytics',
                                     'session_backup_detail',
                                     'session_command_list',
                                     'session_detail',
@@ -529,28 +1175,47 @@ def main():
                                     'session_snapshot_clone_detail',
                                     'session_snapshot_clone_list',
                                     'session_snapshot_detail',
+                                    'session_topology',
                                     'system_log_event_list',
                                     'system_log_packages_list',
                                     'system_session_supported_list',
                                     'system_version_list',
                                     'system_volume_count_list',
                                     'system_active_standby_status']),
+        latest=dict(type='bool', default=False),
+        limit=dict(type='int'),
+        max_count=dict(type='int', default=1000),
         name=dict(type='str'),
+        output_format=dict(type='str', default='records', choices=['records', 'columnar']),
         role=dict(type='str'),
         rolepair=dict(type='str'),
+        server_timeout=dict(type='int', default=300),
+        servers=dict(type='list', elements='dict',
+                     options=dict(hostname=dict(type='str', required=True),
+                                  username=dict(type='str'),
+                                  password=dict(type='str', no_log=True),
+                                  port=dict(type='int'))),
+        since=dict(type='str'),
         snapshot=dict(type='str'),
-        system_id=dict(type='str'),
+        system_id=dict(type='list', elements='str'),
         system_name=dict(type='str'),
-        wwn_name=dict(type='str')
+        to_time=dict(type='int'),
+        volume_catalog=dict(type='path'),
+        volume_catalog_invalidate=dict(type='bool', default=False),
+        volume_catalog_ttl=dict(type='int', default=3600),
+        volume_lookup=dict(type='list', elements='str'),
+        wwn_bulk_threshold=dict(type='int', default=50),
+        wwn_name=dict(type='list', elements='str'),
+        wwn_scan_systems=dict(type='list', elements='str')
     )
 
     module = AnsibleModule(
         argument_spec=argument_spec,
+        mutually_exclusive=[('servers', 'cursor_file')],
         supports_check_mode=True,
     )
 
     gather_info = CSMGatherInfo(module)
-    gather_info.gather_errors = dict()
 
     try:
         gather_info.run_query()
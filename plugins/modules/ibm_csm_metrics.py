@@ -0,0 +1,272 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: ibm_csm_metrics
+short_description: Publishes CSM session and volume health as OpenMetrics text
+description:
+  - Reads the session overviews, the volume counts and the active / standby status of the CSM server and
+    returns them as OpenMetrics text, optionally written to a file for the textfile collector of the
+    Prometheus node exporter.
+  - The server responses are kept in I(cache_file) and reused for I(refresh_interval) seconds, so running
+    the module more often than that does not add load on the CSM server.
+  - When the server cannot be reached the C(csm_up) metric is 0 and the module does not fail.
+version_added: "1.1.0"
+author: Randy Blea (@blearandy)
+options:
+  dest:
+    description:
+      - The file the metrics are written to.  The file is only replaced when the metrics change, so its
+        C(csm_cache_age_seconds) is the age of the server responses when it was last written.
+    type: path
+  cache_file:
+    description:
+      - The file holding the server responses between runs.
+      - Defaults to I(dest) with a C(.cache.json) suffix.  No responses are cached when neither is set.
+    type: path
+  refresh_interval:
+    description:
+      - The number of seconds the cached server responses are used before the server is queried again.
+    type: int
+    default: 60
+notes:
+  - Supports C(check_mode).
+  - The metrics are session state, status, recoverability, copying, copy progress and RPO gauges labelled
+    with the session name, volume count gauges and an info metric of the active / standby status.
+    Session fields that the server does not report are left out.
+extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
+'''
+
+EXAMPLES = r'''
+- name: Publish the CSM metrics to the node exporter textfile collector
+  ibm.csm.ibm_csm_metrics:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    dest: /var/lib/node_exporter/textfile_collector/csm.prom
+    refresh_interval: 300
+
+- name: Return the metrics without writing them
+  ibm.csm.ibm_csm_metrics:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+  register: csm_metrics
+'''
+
+RETURN = r''' # '''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, unwrap_list, volume_field
+from ansible.module_utils._text import to_native
+import json
+import os
+import re
+import tempfile
+import time
+
+LABEL_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+
+SESSION_STATE_KEYS = ('state',)
+SESSION_STATUS_KEYS = ('status',)
+SESSION_RECOVERABLE_KEYS = ('recoverable', 'isRecoverable')
+SESSION_COPYING_KEYS = ('copying', 'isCopying')
+SESSION_PROGRESS_KEYS = ('progress', 'copyProgress', 'percentComplete')
+SESSION_RPO_KEYS = ('rpo', 'currentRPO', 'rpo_seconds', 'average_rpo_seconds')
+
+
+def _escape(value):
+    return to_native(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return 1 if value else 0
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MetricsWriter(object):
+    """OpenMetrics text of metric families, each written with its type and help once."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.families = {}
+
+    def add(self, name, metric_type, help_text, value, labels=None):
+        if value is None:
+            return
+        family = self.families.setdefault(name, (metric_type, help_text, []))
+        family[2].append((dict(self.labels, **(labels or {})), value))
+
+    def text(self):
+        lines = []
+        for name in sorted(self.families):
+            metric_type, help_text, samples = self.families[name]
+            lines.append('# TYPE {0} {1}'.format(name, metric_type))
+            lines.append('# HELP {0} {1}'.format(name, help_text))
+            sample_name = name + '_info' if metric_type == 'info' else name
+            for labels, value in samples:
+                label_text = ','.join('{0}="{1}"'.format(key, _escape(labels[key])) for key in sorted(labels))
+                lines.append('{0}{{{1}}} {2}'.format(sample_name, label_text, value))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter(CSMClientBase):
+
+    def _cache_file(self):
+        if self.params['cache_file']:
+            return self.params['cache_file']
+        if self.params['dest']:
+            return self.params['dest'] + '.cache.json'
+        return None
+
+    def _load_cache(self, cache_file):
+        if cache_file is None or not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+        except ValueError:
+            return None
+        if cache.get('server') != self.hostname or time.time() - cache.get('fetched', 0) >= self.params['refresh_interval']:
+            return None
+        return cache
+
+    def _write(self, path, content):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.' + os.path.basename(path))
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        self.module.atomic_move(tmp_path, path)
+
+    def _fetch(self):
+        return {'server': self.hostname, 'fetched': time.time(),
+                'sessions': self.session_client.get_session_overviews_short().json(),
+                'volume_counts': self.system_client.get_volume_counts().json(),
+                'active_standby': self.system_client.get_active_standby_status().json()}
+
+    @staticmethod
+    def _session_metrics(writer, sessions):
+        for session in unwrap_list(sessions, keys=('sessions', 'results', 'data')):
+            if not isinstance(session, dict) or session.get('name') is None:
+                continue
+            name = session['name']
+            state = volume_field(session, SESSION_STATE_KEYS)
+            if state is not None:
+                writer.add('csm_session_state', 'gauge', 'Current state of the session.', 1, {'session': name, 'state': state})
+            status = volume_field(session, SESSION_STATUS_KEYS)
+            if status is not None:
+                writer.add('csm_session_status', 'gauge', 'Current status of the session.', 1, {'session': name, 'status': status})
+            writer.add('csm_session_recoverable', 'gauge', 'Whether the session is recoverable.',
+                       _number(volume_field(session, SESSION_RECOVERABLE_KEYS)), {'session': name})
+            writer.add('csm_session_copying', 'gauge', 'Whether the session is copying data.',
+                       _number(volume_field(session, SESSION_COPYING_KEYS)), {'session': name})
+            writer.add('csm_session_copy_progress_percent', 'gauge', 'Copy progress of the session.',
+                       _number(volume_field(session, SESSION_PROGRESS_KEYS)), {'session': name})
+            writer.add('csm_session_rpo_seconds', 'gauge', 'Recovery point objective of the session.',
+                       _number(volume_field(session, SESSION_RPO_KEYS)), {'session': name})
+
+    @staticmethod
+    def _volume_count_metrics(writer, volume_counts):
+        if isinstance(volume_counts, dict) and isinstance(volume_counts.get('data'), dict):
+            volume_counts = volume_counts['data']
+        if not isinstance(volume_counts, dict):
+            return
+        for key, value in volume_counts.items():
+            if isinstance(value, dict):
+                for name, count in value.items():
+                    writer.add('csm_volumes', 'gauge', 'Number of volumes managed by the server.', _number(count), {'group': key, 'name': name})
+            elif not isinstance(value, bool):
+                writer.add('csm_volumes', 'gauge', 'Number of volumes managed by the server.', _number(value), {'group': '', 'name': key})
+
+    @staticmethod
+    def _active_standby_metrics(writer, status):
+        if isinstance(status, dict) and isinstance(status.get('data'), dict):
+            status = status['data']
+        if not isinstance(status, dict):
+            return
+        labels = {}
+        for key, value in status.items():
+            label = LABEL_INVALID_CHARS.sub('_', key)
+            if label in writer.labels or key in ('msg', 'msgTranslated') or not isinstance(value, (bool, int, float, str)):
+                continue
+            labels[label] = value
+        writer.add('csm_server_ha', 'info', 'Active / standby status of the server.', 1, labels)
+
+    def export_metrics(self):
+        cache_file = self._cache_file()
+        cache = self._load_cache(cache_file)
+        cached = cache is not None
+        writer = MetricsWriter({'server': self.hostname})
+
+        if cache is None:
+            try:
+                cache = self._fetch()
+            except Exception as e:
+                self.module.warn("Failed to read the metrics from {0}. Error [{1}].".format(self.hostname, to_native(e)))
+            else:
+                if cache_file is not None and not self.module.check_mode:
+                    self._write(cache_file, json.dumps(cache))
+
+        writer.add('csm_up', 'gauge', 'Whether the server responded.', 1 if cache is not None else 0)
+        if cache is not None:
+            writer.add('csm_cache_age_seconds', 'gauge', 'Age of the server responses the metrics are built from.',
+                       round(time.time() - cache['fetched'], 3))
+            self._session_metrics(writer, cache['sessions'])
+            self._volume_count_metrics(writer, cache['volume_counts'])
+            self._active_standby_metrics(writer, cache['active_standby'])
+        metrics = writer.text()
+
+        dest = self.params['dest']
+        if dest is not None:
+            # The cache age changes on every run, so it does not count as a change of the metrics.
+            current = None
+            if os.path.exists(dest):
+                with open(dest, 'r') as f:
+                    current = f.read()
+            self.changed = current is None or self._strip_age(current) != self._strip_age(metrics)
+            if self.changed and not self.module.check_mode:
+                self._write(dest, metrics)
+        return metrics, cached
+
+    @staticmethod
+    def _strip_age(metrics):
+        return '\n'.join(line for line in metrics.splitlines() if not line.startswith('csm_cache_age_seconds'))
+
+
+def main():
+    argument_spec = csm_argument_spec()
+    argument_spec.update(dest=dict(type='path'),
+                         cache_file=dict(type='path'),
+                         refresh_interval=dict(type='int', default=60))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    metrics_exporter = MetricsExporter(module)
+
+    try:
+        metrics, cached = metrics_exporter.export_metrics()
+        module.exit_json(changed=metrics_exporter.changed, metrics=metrics, cached=cached,
+                         call_stats=metrics_exporter.call_stats.as_dict())
+    except Exception as e:
+        metrics_exporter.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -139,7 +139,7 @@ def main():
 
     result = rest_call_manager.perform_rest_action()
 
-    module.exit_json(changed=rest_call_manager.changed, result=result.json())
+    module.exit_json(changed=rest_call_manager.changed, result=result.json(), call_stats=rest_call_manager.call_stats.as_dict())
 
 
 if __name__ == '__main__':
@@ -175,9 +175,9 @@ def main():
     try:
         result = scheduled_task_manager.perform_task_action()
         if scheduled_task_manager.failed:
-            module.fail_json(changed=scheduled_task_manager.changed, result=result)
+            module.fail_json(changed=scheduled_task_manager.changed, result=result, call_stats=scheduled_task_manager.call_stats.as_dict())
         else:
-            module.exit_json(changed=scheduled_task_manager.changed, result=result)
+            module.exit_json(changed=scheduled_task_manager.changed, result=result, call_stats=scheduled_task_manager.call_stats.as_dict())
     except Exception as e:
         scheduled_task_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
 
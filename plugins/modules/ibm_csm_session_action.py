@@ -33,6 +33,9 @@ options:
     type: str
 notes:
   - Supports C(check_mode).
+  - To issue long running commands to many sessions without holding a fork for each, run the task with
+    C(async) and a C(poll) of C(0).  M(ansible.builtin.async_status) returns the result of each command, and
+    M(ibm.csm.ibm_csm_session_job_status) checks the state of all the sessions with one request.
 extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
 '''
 
@@ -53,6 +56,40 @@ EXAMPLES = r'''
     name: 'mysgcsess'
     command: 'Recover Backup'
     backup_id: '1662577200'
+
+- name: Start several sessions without waiting for the commands to complete
+  ibm.csm.ibm_csm_session_action:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    name: "{{ item }}"
+    command: 'Start H1->H2'
+  loop: "{{ sessions }}"
+  async: 3600
+  poll: 0
+  register: start_jobs
+
+- name: Wait for the sessions to reach the Prepared state
+  ibm.csm.ibm_csm_session_job_status:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions: "{{ sessions }}"
+    states:
+      - Prepared
+  register: session_status
+  until: session_status.finished
+  retries: 60
+  delay: 30
+
+- name: Check the result of each start command
+  ansible.builtin.async_status:
+    jid: "{{ item.ansible_job_id }}"
+  loop: "{{ start_jobs.results }}"
+  register: start_results
+  until: start_results.finished
+  retries: 10
+  delay: 5
 '''
 
 RETURN = r''' # '''
@@ -114,9 +151,9 @@ def main():
     try:
         result = session_command_manager.perform_session_command_action()
         if session_command_manager.failed:
-            module.fail_json(changed=session_command_manager.changed, result=result)
+            module.fail_json(changed=session_command_manager.changed, result=result, call_stats=session_command_manager.call_stats.as_dict())
         else:
-            module.exit_json(changed=session_command_manager.changed, result=result)
+            module.exit_json(changed=session_command_manager.changed, result=result, call_stats=session_command_manager.call_stats.as_dict())
     except Exception as e:
         session_command_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
 
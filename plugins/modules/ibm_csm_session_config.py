@@ -0,0 +1,304 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: ibm_csm_session_config
+short_description: Converges CSM sessions to a desired configuration
+description:
+  - Takes the full desired configuration of one or more sessions, compares it with the current
+    configuration on the CSM server and applies only the changes that are needed.
+  - The current state is read first for all the sessions, up to I(max_workers) sessions at the same time.
+    The changes of each session are then applied with at most one request per kind of change, so sessions
+    that already match only cost reads.
+  - The planned changes are returned in C(plan), also in check mode where nothing is applied.
+version_added: "1.1.0"
+author: Randy Blea (@blearandy)
+options:
+  sessions:
+    description:
+      - The desired configuration of each session.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - The name of the session.
+        type: str
+        required: true
+      state:
+        description:
+          - Whether the session should exist.
+        type: str
+        default: present
+        choices:
+          - present
+          - absent
+      type:
+        description:
+          - The session type, as accepted by M(ibm.csm.ibm_csm_session_manage).
+          - Required when the session does not exist yet.  The type of an existing session cannot be changed.
+        type: str
+      description:
+        description:
+          - The description of the session.
+        type: str
+      options:
+        description:
+          - Dictionary of session option names and values.  Only the options listed are compared and set.
+        type: dict
+      copysets:
+        description:
+          - The copy sets of the session, each a list of volume IDs in the order of I(role_order).
+          - Copy sets are identified by their first volume.
+        type: list
+        elements: list
+      role_order:
+        description:
+          - The roles of the volumes in each copy set, for example C(['H1', 'H2']).
+        type: list
+        elements: str
+      purge_copysets:
+        description:
+          - Remove the copy sets of the session that are not listed in I(copysets).
+        type: bool
+        default: false
+  max_workers:
+    description:
+      - The maximum number of sessions read at the same time.
+    type: int
+    default: 8
+notes:
+  - Supports C(check_mode).
+extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
+'''
+
+EXAMPLES = r'''
+- name: Converge two Metro Mirror sessions
+  ibm.csm.ibm_csm_session_config:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions:
+      - name: 'mm_sess_1'
+        type: 'MM'
+        description: 'payroll replication'
+        options:
+          resetReserve: true
+        role_order: ['H1', 'H2']
+        copysets:
+          - ['DS8000:2107.KTLM1:VOL:0001', 'DS8000:2107.KTLM1:VOL:0101']
+          - ['DS8000:2107.KTLM1:VOL:0002', 'DS8000:2107.KTLM1:VOL:0102']
+        purge_copysets: true
+      - name: 'mm_sess_old'
+        state: 'absent'
+
+- name: Show the changes needed without applying them
+  ibm.csm.ibm_csm_session_config:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions: "{{ csm_sessions }}"
+  check_mode: true
+  register: session_plan
+'''
+
+RETURN = r''' # '''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, run_concurrently, unwrap_list, \
+    volume_field, diff_session_options, normalize_session_options, ABSENT, PRESENT
+from ansible.module_utils._text import to_native
+import json
+
+SESSION_TYPE_KEYS = ('type', 'sessionType')
+SESSION_DESCRIPTION_KEYS = ('description', 'desc')
+COPYSET_ID_KEYS = ('copysetID', 'copysetId', 'id', 'name')
+
+
+def _copyset_id(copyset):
+    if isinstance(copyset, dict):
+        copyset = volume_field(copyset, COPYSET_ID_KEYS) or copyset.get('volumes') or ''
+    if isinstance(copyset, list):
+        copyset = copyset[0] if copyset else ''
+    return to_native(copyset)
+
+
+class SessionConfigManager(CSMClientBase):
+
+    def _check_result(self, name, action, response):
+        json_result = response.json()
+        if isinstance(json_result, dict) and json_result.get('msg', '').endswith('E'):
+            self._handle_error("Failed to {action} for the session {name}. ERR: {error}".format(
+                action=action, name=name, error=to_native(json_result.get('msgTranslated'))), json_result)
+        return json_result
+
+    def _existing_sessions(self):
+        overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+        return set(overview.get('name') for overview in overviews if isinstance(overview, dict))
+
+    def _current_copysets(self, name):
+        copysets = unwrap_list(self.session_client.get_copysets(name).json(), keys=('copysets', 'results', 'data'))
+        # Keyed by the normalized ID, valued by the ID as the server reports it.
+        return dict((_copyset_id(copyset).upper(), _copyset_id(copyset)) for copyset in copysets if copyset)
+
+    def _session_info(self, name):
+        info = self.session_client.get_session_info(name).json()
+        if isinstance(info, dict) and isinstance(info.get('data'), dict):
+            info = info['data']
+        return info if isinstance(info, dict) else {}
+
+    def _read_session(self, spec):
+        """Return the current configuration of an existing session, reading only the parts its spec sets."""
+        name = spec['name']
+        current = {'info': None, 'options': {}, 'copysets': {}}
+        if spec['type'] is not None or spec['description'] is not None:
+            current['info'] = self._session_info(name)
+        if spec['options']:
+            current['options'] = normalize_session_options(self.session_client.get_session_options(name).json())
+        if spec['copysets'] is not None:
+            current['copysets'] = self._current_copysets(name)
+        return current
+
+    def _read_sessions(self, existing):
+        specs = [spec for spec in self.params['sessions'] if spec['state'] == PRESENT and spec['name'] in existing]
+        results = run_concurrently(self._read_session, specs, self.params['max_workers'])
+        errors = ["{name} [{error}]".format(name=spec['name'], error=error)
+                  for spec, (current, error) in zip(specs, results) if error is not None]
+        if errors:
+            self._handle_error("Failed to read the sessions {errors}.".format(errors=', '.join(errors)))
+        return dict((spec['name'], current) for spec, (current, error) in zip(specs, results))
+
+    def _plan_session(self, spec, existing, current):
+        name = spec['name']
+        if spec['state'] == ABSENT:
+            return [{'session': name, 'action': 'delete'}] if name in existing else []
+
+        plan = []
+        current_options = {}
+        current_copysets = {}
+        if name not in existing:
+            if spec['type'] is None:
+                self._handle_error("The type is required to create the session {name}.".format(name=name))
+            plan.append({'session': name, 'action': 'create', 'type': spec['type'], 'description': spec['description']})
+        else:
+            info = current['info']
+            if info is not None:
+                current_type = volume_field(info, SESSION_TYPE_KEYS)
+                if spec['type'] is not None and current_type is not None and current_type != spec['type']:
+                    self._handle_error("The session {name} is of type {current}, not {type}. The type of an existing "
+                                       "session cannot be changed.".format(name=name, current=current_type, type=spec['type']))
+                if spec['description'] is not None and volume_field(info, SESSION_DESCRIPTION_KEYS) != spec['description']:
+                    plan.append({'session': name, 'action': 'set_description', 'description': spec['description']})
+            current_options = current['options']
+            current_copysets = current['copysets']
+
+        if spec['options']:
+            diff = diff_session_options(current_options, spec['options'])
+            if diff:
+                plan.append({'session': name, 'action': 'set_options',
+                             'options': dict((key, change['after']) for key, change in diff.items())})
+
+        if spec['copysets'] is not None:
+            wanted = dict((_copyset_id(copyset).upper(), copyset) for copyset in spec['copysets'])
+            missing = [wanted[copyset_id] for copyset_id in wanted if copyset_id not in current_copysets]
+            if missing:
+                plan.append({'session': name, 'action': 'add_copysets', 'copysets': missing, 'role_order': spec['role_order']})
+            if spec['purge_copysets']:
+                extra = sorted(current_copysets[copyset_id] for copyset_id in current_copysets if copyset_id not in wanted)
+                if extra:
+                    plan.append({'session': name, 'action': 'remove_copysets', 'copysets': extra})
+        return plan
+
+    def _apply(self, step):
+        name = step['session']
+        if step['action'] == 'create':
+            response = self.session_client.create_session(name, step['type'], step['description'])
+            action = 'create the session'
+        elif step['action'] == 'delete':
+            response = self.session_client.delete_session(name)
+            action = 'delete the session'
+        elif step['action'] == 'set_description':
+            response = self.session_client.modify_session_description(name, step['description'])
+            action = 'modify the description'
+        elif step['action'] == 'set_options':
+            response = self.set_session_options(name, step['options'])
+            action = 'set the options'
+        elif step['action'] == 'add_copysets':
+            response = self.session_client.add_copysets(name, step['copysets'], step['role_order'])
+            action = 'add the copy sets'
+        else:
+            response = self.session_client.remove_copysets(name, step['copysets'], False, False)
+            action = 'remove the copy sets'
+        step['result'] = self._check_result(name, action, response)
+
+    def _handle_error(self, msg, server_result=None):
+        result = {'msg': msg}
+        self.failed = True
+        if server_result is None:
+            server_result = {'result': "No server result returned"}
+        self.module.fail_json(
+            msg=result['msg'],
+            server_result={'server_result': server_result}
+        )
+        return json.dumps(result, indent=4)
+
+    def configure_sessions(self):
+        names = [spec['name'] for spec in self.params['sessions']]
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            self._handle_error("Sessions listed more than once: {names}.".format(names=', '.join(duplicates)))
+
+        # Every session is read before anything is changed, so a spec error leaves the server untouched.
+        existing = self._existing_sessions()
+        current = self._read_sessions(existing)
+        plan = []
+        for spec in self.params['sessions']:
+            plan.extend(self._plan_session(spec, existing, current.get(spec['name'])))
+
+        if plan:
+            self.changed = True
+        if not self.module.check_mode:
+            for step in plan:
+                self._apply(step)
+        return plan
+
+
+def main():
+    argument_spec = csm_argument_spec()
+    argument_spec.update(sessions=dict(type='list', elements='dict', required=True,
+                                       options=dict(name=dict(type='str', required=True),
+                                                    state=dict(type='str', default=PRESENT, choices=[ABSENT, PRESENT]),
+                                                    type=dict(type='str'),
+                                                    description=dict(type='str'),
+                                                    options=dict(type='dict'),
+                                                    copysets=dict(type='list', elements='list'),
+                                                    role_order=dict(type='list', elements='str'),
+                                                    purge_copysets=dict(type='bool', default=False))),
+                         max_workers=dict(type='int', default=8))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    session_config_manager = SessionConfigManager(module)
+
+    try:
+        plan = session_config_manager.configure_sessions()
+        module.exit_json(changed=session_config_manager.changed, plan=plan,
+                         call_stats=session_config_manager.call_stats.as_dict())
+    except Exception as e:
+        session_config_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
+
+
+if __name__ == '__main__':
+    main()
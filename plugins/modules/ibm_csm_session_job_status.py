@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: ibm_csm_session_job_status
+short_description: Checks whether the commands issued to CSM sessions have completed
+description:
+  - Returns the state and status of a set of sessions, and whether each one has completed the command
+    last issued to it, such as a command issued by M(ibm.csm.ibm_csm_session_action) run with C(async) and a C(poll) of C(0).
+  - A session has completed its command once it is in one of I(states) or, when I(states) is not set,
+    once it is no longer in a transitional state such as C(Preparing), C(Suspending) or C(Recovering).
+  - All the sessions are checked with a single short session overview request to the CSM server, so one
+    task can poll a large number of sessions.
+version_added: "1.1.0"
+author: Randy Blea (@blearandy)
+options:
+  sessions:
+    description:
+      - The names of the sessions to check.
+    type: list
+    elements: str
+    required: true
+  states:
+    description:
+      - The states the sessions are expected to reach, for example C(Prepared) or C(Target Available).
+    type: list
+    elements: str
+notes:
+  - Supports C(check_mode).
+  - The result of the command itself is returned by M(ansible.builtin.async_status) for the job of the
+    M(ibm.csm.ibm_csm_session_action) task.
+extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
+'''
+
+EXAMPLES = r'''
+- name: Wait for the sessions started asynchronously to be prepared
+  ibm.csm.ibm_csm_session_job_status:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions: "{{ sessions }}"
+    states:
+      - Prepared
+  register: session_status
+  until: session_status.finished
+  retries: 60
+  delay: 30
+
+- name: Check that no session is still in a transitional state
+  ibm.csm.ibm_csm_session_job_status:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions:
+      - 'sessionA'
+      - 'sessionB'
+'''
+
+RETURN = r''' # '''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, unwrap_list, volume_field
+from ansible.module_utils._text import to_native
+import json
+import re
+
+SESSION_STATE_KEYS = ('state', 'sessionState')
+SESSION_STATUS_KEYS = ('status', 'sessionStatus')
+# The states a session passes through while it carries out a command, such as Preparing or Recovering
+TRANSITIONAL_STATE = re.compile(r'ing$', re.IGNORECASE)
+
+
+class SessionJobStatusChecker(CSMClientBase):
+
+    def _session_overviews(self):
+        overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+        return dict((overview.get('name'), overview) for overview in overviews if isinstance(overview, dict))
+
+    def _handle_error(self, msg, server_result=None):
+        result = {'msg': msg}
+        self.failed = True
+        if server_result is None:
+            server_result = {'result': "No server result returned"}
+        self.module.fail_json(
+            msg=result['msg'],
+            server_result={'server_result': server_result}
+        )
+        return json.dumps(result, indent=4)
+
+    def _finished(self, state):
+        if self.params['states']:
+            return state in self.params['states']
+        return state is not None and not TRANSITIONAL_STATE.search(state)
+
+    def check_sessions(self):
+        overviews = self._session_overviews()
+        missing = [name for name in self.params['sessions'] if name not in overviews]
+        if missing:
+            self._handle_error("Sessions not found on the server: {names}.".format(names=', '.join(missing)))
+
+        sessions = {}
+        for name in self.params['sessions']:
+            state = volume_field(overviews[name], SESSION_STATE_KEYS)
+            state = to_native(state) if state is not None else None
+            sessions[name] = {'state': state, 'status': volume_field(overviews[name], SESSION_STATUS_KEYS),
+                              'finished': self._finished(state)}
+        return sessions
+
+
+def main():
+    argument_spec = csm_argument_spec()
+    argument_spec.update(sessions=dict(type='list', elements='str', required=True),
+                         states=dict(type='list', elements='str'))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    job_status_checker = SessionJobStatusChecker(module)
+
+    try:
+        sessions = job_status_checker.check_sessions()
+        module.exit_json(changed=False, sessions=sessions,
+                         pending=sum(1 for session in sessions.values() if not session['finished']),
+                         finished=all(session['finished'] for session in sessions.values()),
+                         call_stats=job_status_checker.call_stats.as_dict())
+    except Exception as e:
+        job_status_checker.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -75,8 +75,74 @@ options:
       - The name of a hardware volume group that will be tied to the session
       - Required when name is not specified.
     type: str
+  volume_groups:
+    description:
+      - Creates a session for each of the hardware volume groups listed.
+      - The sessions of the server are read once, the volume groups whose session already exists are
+        skipped and the other sessions are created concurrently.  A result is returned per volume group.
+      - Cannot be used with I(name) or I(volume_group), and only with I(state=present).
+    type: list
+    elements: dict
+    version_added: "1.1.0"
+    suboptions:
+      volume_group:
+        description:
+          - The name of the hardware volume group.
+        type: str
+        required: true
+      type:
+        description:
+          - The type of the session that will be created.
+        type: str
+        required: true
+        choices:
+          - ESESizer
+          - FC
+          - Snapshot
+          - SGC
+          - SGCSVC
+          - SnapshotSVC
+          - Migration
+          - MMBasic
+          - MM
+          - MMPracticeOneSite
+          - MMPracticeOneSiteSVC
+          - MMCVSVC
+          - GMBasic
+          - GMBasicSVC
+          - GM
+          - GMSVC
+          - GMPracticeOneSiteSVC
+          - GMPracticeOneSite
+          - GMPracticeTwoSite
+          - GMCVSVC
+          - GMTwoSite
+          - GMTwoSiteWithSite3
+          - MGM
+          - MGMPRacticeOneSite
+          - MT_MM_MM
+          - MT_MM_GM
+          - MT_MM_GMPractice
+          - MT_MM_GM_Site3GM
+          - MT_MM_GM_4Site
+          - MT_MM_MM_4Site
+      description:
+        description:
+          - The description of the session.
+        type: str
+      name:
+        description:
+          - The name the server gives the session, used to find whether it already exists.
+          - Defaults to the last part of I(volume_group), the name of the volume group on the storage system.
+        type: str
+  max_workers:
+    description:
+      - The maximum number of sessions created at the same time with I(volume_groups).
+    type: int
+    default: 8
+    version_added: "1.1.0"
 notes:
-  - Supports C(check_mode).
+  - Supports C(check_mode).  With I(volume_groups) no session is created in check mode.
 extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
 '''
 
@@ -116,15 +182,62 @@ EXAMPLES = r'''
     name: 'my_three_site_sess'
     state: 'present'
     description: 'this session manages replication to Los Angeles and New York'
+
+- name: Create the Snapshot sessions of all the volume groups of a new storage system
+  ibm.csm.ibm_csm_session_manage:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    state: 'present'
+    volume_groups:
+      - volume_group: 'SPECTRUM-VIRTUALIZE:VOLGROUP:FAB3-DEV13:rgroup_01'
+        type: 'SnapshotSVC'
+      - volume_group: 'SPECTRUM-VIRTUALIZE:VOLGROUP:FAB3-DEV13:rgroup_02'
+        type: 'SnapshotSVC'
+        description: 'payroll database'
+    max_workers: 10
+  register: created
 '''
 
 RETURN = r''' # '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, ABSENT, PRESENT
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, run_concurrently, \
+    unwrap_list, ABSENT, PRESENT
 from ansible.module_utils._text import to_native
 import json
 
+SESSION_TYPES = ['ESESizer',
+                 'FC',
+                 'Snapshot',
+                 'SGC',
+                 'SGCSVC',
+                 'SnapshotSVC',
+                 'Migration',
+                 'MMBasic',
+                 'MM',
+                 'MMPracticeOneSite',
+                 'MMPracticeOneSiteSVC',
+                 'MMCVSVC',
+                 'GMBasic',
+                 'GMBasicSVC',
+                 'GM',
+                 'GMSVC',
+                 'GMPracticeOneSiteSVC',
+                 'GMPracticeOneSite',
+                 'GMPracticeTwoSite',
+                 'GMCVSVC',
+                 'GMTwoSite',
+                 'GMTwoSiteWithSite3',
+                 'MGM',
+                 'MGMPRacticeOneSite',
+                 'MT_MM_MM',
+                 'MT_MM_GM',
+                 'MT_MM_GMPractice',
+                 'MT_MM_GM_Site3GM',
+                 'MT_MM_GM_4Site',
+                 'MT_MM_MM_4Site']
+
 
 class SessionManager(CSMClientBase):
     def _create_or_update_session(self):
@@ -169,6 +282,49 @@ class SessionManager(CSMClientBase):
 
         return json_result
 
+    def _create_volume_group_session(self, entry):
+        result = {'volume_group': entry['volume_group'], 'name': entry['name'], 'action': 'create'}
+        if self.module.check_mode:
+            return result
+
+        json_result = self.session_client.create_session_by_volgroup_name(entry['volume_group'], entry['type'],
+                                                                          entry['description']).json()
+        result['result'] = json_result
+        if json_result['msg'] == 'IWNR1019E':
+            result['action'] = 'exists'
+        elif json_result['msg'].endswith('E'):
+            result['failed'] = True
+            result['msg'] = "Failed to create the session for the volume group {volume_group}. ERR: {error}".format(
+                volume_group=entry['volume_group'], error=to_native(json_result['msgTranslated']))
+        return result
+
+    def _create_sessions_by_volume_groups(self):
+        overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+        existing = set(overview.get('name') for overview in overviews if isinstance(overview, dict))
+
+        entries = []
+        for entry in self.params['volume_groups']:
+            entry = dict(entry)
+            if entry['name'] is None:
+                entry['name'] = entry['volume_group'].split(':')[-1]
+            entries.append(entry)
+        to_create = [entry for entry in entries if entry['name'] not in existing]
+
+        created = dict()
+        for entry, (result, error) in zip(to_create, run_concurrently(self._create_volume_group_session, to_create,
+                                                                      self.params['max_workers'])):
+            if error is not None:
+                result = {'volume_group': entry['volume_group'], 'name': entry['name'], 'action': 'create', 'failed': True,
+                          'msg': "Failed to create the session for the volume group {volume_group}. Error [{error}]."
+                          .format(volume_group=entry['volume_group'], error=error)}
+            created[id(entry)] = result
+
+        results = [created.get(id(entry), {'volume_group': entry['volume_group'], 'name': entry['name'], 'action': 'exists'})
+                   for entry in entries]
+        self.changed = any(result['action'] == 'create' and not result.get('failed') for result in results)
+        self.failed = any(result.get('failed') for result in results)
+        return results
+
     def _delete_session(self):
         delete_result = self.session_client.delete_session(self.params['name'])
 
@@ -196,6 +352,11 @@ class SessionManager(CSMClientBase):
         return json.dumps(create_result, indent=4)
 
     def manage_session(self):
+        if self.params['volume_groups'] is not None:
+            if self.params['state'] != PRESENT:
+                return self._handle_error("volume_groups can only be used with state present.")
+            return self._create_sessions_by_volume_groups()
+
         if self.params['state'] == PRESENT:
             if self.params['name'] is None:
                 return self._create_session_by_volume_group()
@@ -210,41 +371,19 @@ def main():
     argument_spec = csm_argument_spec()
     argument_spec.update(name=dict(type='str'),
                          description=dict(type='str'),
-                         type=dict(type='str', choices=['ESESizer',
-                                                        'FC',
-                                                        'Snapshot',
-                                                        'SGC',
-                                                        'SGCSVC',
-                                                        'SnapshotSVC',
-                                                        'Migration',
-                                                        'MMBasic',
-                                                        'MM',
-                                                        'MMPracticeOneSite',
-                                                        'MMPracticeOneSiteSVC',
-                                                        'MMCVSVC',
-                                                        'GMBasic',
-                                                        'GMBasicSVC',
-                                                        'GM',
-                                                        'GMSVC',
-                                                        'GMPracticeOneSiteSVC',
-                                                        'GMPracticeOneSite',
-                                                        'GMPracticeTwoSite',
-                                                        'GMCVSVC',
-                                                        'GMTwoSite',
-                                                        'GMTwoSiteWithSite3',
-                                                        'MGM',
-                                                        'MGMPRacticeOneSite',
-                                                        'MT_MM_MM',
-                                                        'MT_MM_GM',
-                                                        'MT_MM_GMPractice',
-                                                        'MT_MM_GM_Site3GM',
-                                                        'MT_MM_GM_4Site',
-                                                        'MT_MM_MM_4Site']),
+                         type=dict(type='str', choices=SESSION_TYPES),
                          state=dict(type='str', default=PRESENT, choices=[ABSENT, PRESENT]),
-                         volume_group=dict(type='str'))
+                         volume_group=dict(type='str'),
+                         volume_groups=dict(type='list', elements='dict',
+                                            options=dict(volume_group=dict(type='str', required=True),
+                                                         type=dict(type='str', required=True, choices=SESSION_TYPES),
+                                                         description=dict(type='str'),
+                                                         name=dict(type='str'))),
+                         max_workers=dict(type='int', default=8))
 
     module = AnsibleModule(
         argument_spec=argument_spec,
+        mutually_exclusive=[('volume_groups', 'name'), ('volume_groups', 'volume_group')],
         supports_check_mode=True,
     )
 
@@ -252,10 +391,14 @@ def main():
 
     try:
         result = session_manager.manage_session()
-        if session_manager.failed:
-            module.fail_json(changed=session_manager.changed, result=result)
+        if session_manager.failed and module.params['volume_groups'] is not None:
+            failed = [entry['volume_group'] for entry in result if entry.get('failed')]
+            module.fail_json(msg="Failed to create the sessions for the volume groups {0}.".format(', '.join(failed)),
+                             changed=session_manager.changed, result=result, call_stats=session_manager.call_stats.as_dict())
+        elif session_manager.failed:
+            module.fail_json(changed=session_manager.changed, result=result, call_stats=session_manager.call_stats.as_dict())
         else:
-            module.exit_json(changed=session_manager.changed, result=result)
+            module.exit_json(changed=session_manager.changed, result=result, call_stats=session_manager.call_stats.as_dict())
     except Exception as e:
         session_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
 
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: ibm_csm_session_options
+short_description: Sets the options of CSM sessions
+description:
+  - Sets the desired options of one or more sessions on the CSM server.
+  - The options of each session are read once and only the options whose value differs are sent.
+    Sessions are handled concurrently.
+  - Returns the options changed for each session, and supports C(--diff).
+version_added: "1.1.0"
+author: Randy Blea (@blearandy)
+options:
+  sessions:
+    description:
+      - The sessions and the options to set on each of them.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - The name of the session.
+        type: str
+        required: true
+      options:
+        description:
+          - Dictionary of option names and values.  Options not listed are left unchanged.
+        type: dict
+        required: true
+  max_workers:
+    description:
+      - The maximum number of sessions read and updated at the same time.
+    type: int
+    default: 8
+notes:
+  - Supports C(check_mode).
+  - The session options that are available depend on the session type.  Use the session_option_list
+    subset of M(ibm.csm.ibm_csm_info) to list them.
+extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
+'''
+
+EXAMPLES = r'''
+- name: Set different options per session
+  ibm.csm.ibm_csm_session_options:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions:
+      - name: 'gm_sess_1'
+        options:
+          consistencyGroupInterval: 10
+      - name: 'gm_sess_2'
+        options:
+          consistencyGroupInterval: 30
+
+- name: Show the option changes needed for a list of sessions defined in a variable
+  ibm.csm.ibm_csm_session_options:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions: "{{ csm_session_options }}"
+  check_mode: true
+  diff: true
+'''
+
+RETURN = r''' # '''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, \
+    diff_session_options, normalize_session_options, run_concurrently
+from ansible.module_utils._text import to_native
+
+
+class SessionOptionsManager(CSMClientBase):
+
+    def _update_session(self, spec):
+        name = spec['name']
+        current = normalize_session_options(self.session_client.get_session_options(name).json())
+        result = {'name': name, 'diff': diff_session_options(current, spec['options'])}
+        if not result['diff'] or self.module.check_mode:
+            return result
+
+        json_result = self.set_session_options(name, dict((key, change['after']) for key, change in result['diff'].items())).json()
+        result['result'] = json_result
+        if isinstance(json_result, dict) and json_result.get('msg', '').endswith('E'):
+            result['failed'] = True
+            result['msg'] = "Failed to set the options of the session {name}. ERR: {error}".format(
+                name=name, error=to_native(json_result.get('msgTranslated')))
+        return result
+
+    def update_session_options(self):
+        sessions = []
+        for spec, (result, error) in zip(self.params['sessions'],
+                                         run_concurrently(self._update_session, self.params['sessions'], self.params['max_workers'])):
+            if error is not None:
+                result = {'name': spec['name'], 'failed': True,
+                          'msg': "Failed to set the options of the session {name}. Error [{error}]."
+                          .format(name=spec['name'], error=error)}
+            sessions.append(result)
+
+        self.changed = any(session.get('diff') and not session.get('failed') for session in sessions)
+        self.failed = any(session.get('failed') for session in sessions)
+        return sessions
+
+
+def main():
+    argument_spec = csm_argument_spec()
+    argument_spec.update(sessions=dict(type='list', elements='dict', required=True,
+                                       options=dict(name=dict(type='str', required=True),
+                                                    options=dict(type='dict', required=True))),
+                         max_workers=dict(type='int', default=8))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    session_options_manager = SessionOptionsManager(module)
+
+    try:
+        sessions = session_options_manager.update_session_options()
+        diff = {'before': dict((session['name'], dict((key, change['before']) for key, change in session.get('diff', {}).items()))
+                               for session in sessions),
+                'after': dict((session['name'], dict((key, change['after']) for key, change in session.get('diff', {}).items()))
+                              for session in sessions)}
+        if session_options_manager.failed:
+            failed = [session['name'] for session in sessions if session.get('failed')]
+            module.fail_json(msg="Failed to set the options of the sessions {names}.".format(names=', '.join(failed)),
+                             changed=session_options_manager.changed, sessions=sessions)
+        module.exit_json(changed=session_options_manager.changed, sessions=sessions, diff=diff,
+                         call_stats=session_options_manager.call_stats.as_dict())
+    except Exception as e:
+        session_options_manager.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: ibm_csm_session_progress
+short_description: Waits for CSM sessions to finish copying and estimates when they will
+description:
+  - Polls the copy progress of a set of sessions until all of them reach 100% or I(timeout) expires.
+  - Each poll is one short session overview request over the same login, so a large number of sessions
+    can be followed without the cost of the full session overview.
+  - The throughput and ETA of each session are estimated from the last I(window) progress samples.
+  - Every poll is written to the log of the managed node and returned in C(snapshots).
+version_added: "1.1.0"
+author: Randy Blea (@blearandy)
+options:
+  sessions:
+    description:
+      - The names of the sessions to follow.
+    type: list
+    elements: str
+    required: true
+  poll_interval:
+    description:
+      - The number of seconds between two polls.
+    type: int
+    default: 30
+  timeout:
+    description:
+      - The number of seconds after which the module returns even if some sessions are still copying.
+      - The module does not fail when the timeout expires.  Check C(finished) or C(timed_out).
+    type: int
+    default: 3600
+  window:
+    description:
+      - The number of most recent progress samples of a session used to estimate its throughput.
+    type: int
+    default: 10
+notes:
+  - Supports C(check_mode).
+  - The progress is the copy progress percentage reported in the short session overview.
+    A session that does not report one is treated as finished when it is not copying.
+extends_documentation_fragment: ibm.csm.csm_client_fragment.documentation
+'''
+
+EXAMPLES = r'''
+- name: Wait up to two hours for the initial copy of the sessions
+  ibm.csm.ibm_csm_session_progress:
+    hostname: "{{ csm_host }}"
+    username: "{{ csm_username }}"
+    password: "{{ csm_password }}"
+    sessions:
+      - 'gm_sess_1'
+      - 'gm_sess_2'
+    poll_interval: 60
+    timeout: 7200
+  register: progress
+
+- name: Fail when a session has not finished copying
+  ansible.builtin.assert:
+    that:
+      - progress.finished
+    fail_msg: "Still copying: {{ progress.sessions | dict2items | rejectattr('value.finished') | map(attribute='key') | list }}"
+'''
+
+RETURN = r''' # '''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client import CSMClientBase, csm_argument_spec, unwrap_list, volume_field
+from ansible.module_utils._text import to_native
+from collections import deque
+import json
+import time
+
+SESSION_PROGRESS_KEYS = ('progress', 'copyProgress', 'percentComplete', 'copying_progress')
+SESSION_COPYING_KEYS = ('copying', 'isCopying')
+
+
+def _progress(overview):
+    value = volume_field(overview, SESSION_PROGRESS_KEYS)
+    if value is None:
+        return None
+    try:
+        return float(to_native(value).rstrip('%'))
+    except ValueError:
+        return None
+
+
+class ProgressTracker(object):
+    """The last progress samples of a session and the throughput and ETA estimated from them."""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=max(2, window))
+        self.copying = None
+
+    def add(self, sample_time, progress, copying):
+        self.copying = copying
+        if progress is not None:
+            self.samples.append((sample_time, progress))
+
+    @property
+    def progress(self):
+        return self.samples[-1][1] if self.samples else None
+
+    @property
+    def finished(self):
+        if self.progress is not None:
+            return self.progress >= 100
+        return self.copying is False
+
+    @property
+    def rate(self):
+        """The progress in percent per second over the window, or None until it can be estimated."""
+        if len(self.samples) < 2:
+            return None
+        (first_time, first_progress), (last_time, last_progress) = self.samples[0], self.samples[-1]
+        if last_time <= first_time:
+            return None
+        return (last_progress - first_progress) / (last_time - first_time)
+
+    def summary(self):
+        rate = self.rate
+        eta = None
+        if self.finished:
+            eta = 0
+        elif rate is not None and rate > 0 and self.progress is not None:
+            eta = int(round((100 - self.progress) / rate))
+        return {'progress': self.progress, 'copying': self.copying, 'finished': self.finished,
+                'percent_per_minute': round(rate * 60, 3) if rate is not None else None, 'eta_seconds': eta}
+
+
+class SessionProgressMonitor(CSMClientBase):
+
+    def _poll(self):
+        overviews = unwrap_list(self.session_client.get_session_overviews_short().json(), keys=('sessions', 'results', 'data'))
+        wanted = set(self.params['sessions'])
+        return dict((overview.get('name'), overview) for overview in overviews
+                    if isinstance(overview, dict) and overview.get('name') in wanted)
+
+    def _handle_error(self, msg, server_result=None):
+        result = {'msg': msg}
+        self.failed = True
+        if server_result is None:
+            server_result = {'result': "No server result returned"}
+        self.module.fail_json(
+            msg=result['msg'],
+            server_result={'server_result': server_result}
+        )
+        return json.dumps(result, indent=4)
+
+    def monitor(self):
+        deadline = time.time() + self.params['timeout']
+        trackers = dict((name, ProgressTracker(self.params['window'])) for name in self.params['sessions'])
+        snapshots = []
+
+        while True:
+            sample_time = time.time()
+            overviews = self._poll()
+            missing = [name for name in trackers if name not in overviews]
+            if missing:
+                self._handle_error("Sessions not found on the server: {names}.".format(names=', '.join(missing)))
+
+            for name, tracker in trackers.items():
+                copying = volume_field(overviews[name], SESSION_COPYING_KEYS)
+                tracker.add(sample_time, _progress(overviews[name]), None if copying is None else bool(copying))
+            snapshot = {'time': int(sample_time),
+                        'sessions': dict((name, tracker.summary()) for name, tracker in trackers.items())}
+            snapshots.append(snapshot)
+            self.module.log("CSM session progress: {0}".format(json.dumps(snapshot, sort_keys=True)))
+
+            finished = all(tracker.finished for tracker in trackers.values())
+            if finished or time.time() + self.params['poll_interval'] > deadline:
+                return snapshot['sessions'], finished, snapshots
+            time.sleep(self.params['poll_interval'])
+
+
+def main():
+    argument_spec = csm_argument_spec()
+    argument_spec.update(sessions=dict(type='list', elements='str', required=True),
+                         poll_interval=dict(type='int', default=30),
+                         timeout=dict(type='int', default=3600),
+                         window=dict(type='int', default=10))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+    )
+
+    progress_monitor = SessionProgressMonitor(module)
+
+    try:
+        sessions, finished, snapshots = progress_monitor.monitor()
+        module.exit_json(changed=False, sessions=sessions, finished=finished, timed_out=not finished,
+                         snapshots=snapshots, call_stats=progress_monitor.call_stats.as_dict())
+    except Exception as e:
+        progress_monitor.module.fail_json(msg="Module failed. Error [%s]." % to_native(e))
+
+
+if __name__ == '__main__':
+    main()
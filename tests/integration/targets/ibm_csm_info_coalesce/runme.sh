@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+# Coalescing happens between the forks running one task, so the play needs several hosts.
+set -eux
+
+ansible-playbook -i inventory --forks 3 coalesce.yml -e @../../integration_config.yml "$@"
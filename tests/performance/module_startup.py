@@ -0,0 +1,98 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+"""
+Measure the startup cost of the modules of the collection: the size of their AnsiballZ payload, the
+time to import them, reported by python -X importtime, and the time to start them up to their argument
+check, with no server.  The pyCSM clients, imported by a module the first time it uses one, are measured
+apart.  Run it from a collection installed in an ansible_collections tree, with ansible-core installed:
+
+    python tests/performance/module_startup.py [--runs 5] [module ...]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+COLLECTION_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+COLLECTIONS_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(COLLECTION_DIR)))
+MODULES_DIR = os.path.join(COLLECTION_DIR, 'plugins', 'modules')
+MODULES_PACKAGE = 'ansible_collections.ibm.csm.plugins.modules'
+CLIENT_MODULES = ('pyCSM.clients.session_client', 'pyCSM.clients.hardware_client', 'pyCSM.clients.system_client')
+
+
+def payload_size(name):
+    """Return the size in bytes of the AnsiballZ payload of the module, as the controller builds it by default."""
+    from ansible.executor.module_common import modify_module
+    from ansible.parsing.dataloader import DataLoader
+    from ansible.template import Templar
+    from ansible.utils.collection_loader._collection_finder import _AnsibleCollectionFinder
+
+    _AnsibleCollectionFinder(paths=[COLLECTIONS_ROOT])._install()
+    built = modify_module(module_name='ibm.csm.' + name, module_path=os.path.join(MODULES_DIR, name + '.py'), module_args={},
+                          templar=Templar(loader=DataLoader()), task_vars={'ansible_python_interpreter': sys.executable},
+                          module_compression='ZIP_DEFLATED')
+    return len(getattr(built, 'b_module_data', None) or built[0])
+
+
+def _python(arguments, stdin=None):
+    env = dict(os.environ, PYTHONPATH=COLLECTIONS_ROOT)
+    process = subprocess.Popen([sys.executable] + arguments, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate(stdin)
+    return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+
+def import_time(module_names):
+    """Return the cumulative import time in milliseconds of each module, imported in this order in one interpreter."""
+    imports = '; '.join('import ' + module_name for module_name in module_names)
+    stdout, stderr = _python(['-X', 'importtime', '-c', imports])
+    times = {}
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if line.startswith('import time:') and len(parts) == 3 and parts[2].strip() in module_names:
+            times[parts[2].strip()] = int(parts[1]) / 1000.0
+    return [times.get(module_name) for module_name in module_names]
+
+
+def startup_time(name, runs):
+    """Return the best wall time in milliseconds to start the module and fail its argument check."""
+    arguments = json.dumps({'ANSIBLE_MODULE_ARGS': {}}).encode('utf-8')
+    best = None
+    for run in range(runs):
+        start = time.time()
+        _python(['-m', '{0}.{1}'.format(MODULES_PACKAGE, name)], stdin=arguments)
+        elapsed = (time.time() - start) * 1000.0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='the number of starts of each module, the best is reported')
+    parser.add_argument('modules', nargs='*', help='the modules to measure, all by default')
+    args = parser.parse_args()
+    names = args.modules or sorted(file_name[:-3] for file_name in os.listdir(MODULES_DIR)
+                                   if file_name.endswith('.py') and not file_name.startswith('_'))
+
+    print('{0:34} {1:>12} {2:>12} {3:>12}'.format('module', 'payload [B]', 'import [ms]', 'startup [ms]'))
+    for name in names:
+        module_import, = import_time(['{0}.{1}'.format(MODULES_PACKAGE, name)])
+        print('{0:34} {1:>12} {2:>12.1f} {3:>12.1f}'.format(name, payload_size(name), module_import, startup_time(name, args.runs)))
+
+    print('')
+    print('{0:34} {1:>12}'.format('pyCSM client, on first use', 'import [ms]'))
+    for module_name, client_import in zip(CLIENT_MODULES, import_time(list(CLIENT_MODULES))):
+        print('{0:34} {1:>12}'.format(module_name, 'not installed' if client_import is None else '{0:.1f}'.format(client_import)))
+
+
+if __name__ == '__main__':
+    main()
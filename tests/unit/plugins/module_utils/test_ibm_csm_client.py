@@ -0,0 +1,25 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import subprocess
+import sys
+
+# Importing the client module must not import the pyCSM clients, nor requests through them: together they
+# take about 140 ms to import, most of it requests, and a module that needs no client does not pay for it.
+IMPORTED_MODULES = '''
+import json, sys
+import ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_client
+print(json.dumps(sorted(name for name in sys.modules if name.startswith(('pyCSM.', 'requests')))))
+'''
+
+
+def test_import_does_not_load_the_pycsm_clients():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    output = subprocess.check_output([sys.executable, '-c', IMPORTED_MODULES], env=env)
+    assert json.loads(output.decode('utf-8').splitlines()[-1]) == []
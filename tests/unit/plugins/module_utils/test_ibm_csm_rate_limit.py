@@ -0,0 +1,23 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_rate_limit import RateLimiter
+
+
+def test_lock_dir_created_by_another_fork(tmp_path, monkeypatch):
+    lock_dir = tmp_path / 'locks'
+    makedirs = os.makedirs
+
+    def makedirs_after_another_fork(path, *args, **kwargs):
+        os.mkdir(path)
+        return makedirs(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'makedirs', makedirs_after_another_fork)
+    limiter = RateLimiter.for_server(str(lock_dir), 'csm.example.com', 9559, calls_per_second=5)
+    assert limiter.path == str(lock_dir / 'csm.example.com_9559.json')
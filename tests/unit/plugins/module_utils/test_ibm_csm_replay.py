@@ -0,0 +1,57 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_replay import FixtureStore, RecordingClient, ReplayClient
+
+
+class Response(object):
+    status_code = 200
+    headers = {'Content-Type': 'application/json'}
+    content = b'{"msg": "IWNR1234I"}'
+
+
+class SystemClient(object):
+    """Adds its token to the headers of the rest_* calls, like the pyCSM clients."""
+
+    base_url = 'https://csm.example.com:9559/CSM/web'
+
+    def __init__(self):
+        self.tk = 'a-token-of-the-session'
+
+    def rest_put(self, url, data, headers):
+        headers['X-Auth-Token'] = self.tk
+        return Response()
+
+
+def test_rest_call_recorded_then_replayed(tmp_path):
+    url = SystemClient.base_url + '/sessions/mm_sess/options'
+    recording = RecordingClient(SystemClient(), 'system', FixtureStore(str(tmp_path)))
+    recording.rest_put(url, {'resetReserve': 'true'}, {'Accept-Language': 'en-US'})
+
+    fixture, = [json.loads(path.read_text()) for path in tmp_path.iterdir()]
+    assert fixture['args'] == ['{base_url}/sessions/mm_sess/options', {'resetReserve': 'true'}, {'Accept-Language': 'en-US'}]
+
+    replay = ReplayClient('system', FixtureStore(str(tmp_path), latency=0), 'csm.example.com', 9559)
+    response = replay.rest_put(url, {'resetReserve': 'true'}, {'Accept-Language': 'en-US'})
+    assert response.json() == {'msg': 'IWNR1234I'}
+
+
+def test_record_dir_created_by_another_fork(tmp_path, monkeypatch):
+    record_dir = tmp_path / 'fixtures'
+    makedirs = os.makedirs
+
+    def makedirs_after_another_fork(path, *args, **kwargs):
+        os.mkdir(path)
+        return makedirs(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'makedirs', makedirs_after_another_fork)
+    recording = RecordingClient(SystemClient(), 'system', FixtureStore(str(record_dir)))
+    recording.rest_put(SystemClient.base_url + '/sessions/mm_sess/options', {'resetReserve': 'true'}, {})
+    assert len(list(record_dir.iterdir())) == 1
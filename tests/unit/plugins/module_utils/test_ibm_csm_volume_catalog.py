@@ -0,0 +1,26 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sqlite3
+
+import pytest
+
+from ansible_collections.ibm.csm.plugins.module_utils.ibm_csm_volume_catalog import VolumeCatalog
+
+VOLUMES = [{'id': 'DS8000:2107.A:VOL:0001', 'name': 'vol_0001', 'wwn': '6005076303FFDA0001'}]
+
+
+def test_failed_store_keeps_the_stored_volumes(tmp_path):
+    catalog = VolumeCatalog(str(tmp_path / 'volumes.db'), 3600)
+    catalog.store('csm:9559', '2107.A', VOLUMES)
+    # An ID that cannot be stored fails the inserts after the old volumes were deleted
+    with pytest.raises(sqlite3.Error):
+        catalog.store('csm:9559', '2107.A', [{'id': {'unexpected': 'record'}, 'wwn': '6005076303FFDA0002'}])
+
+    reader = VolumeCatalog(str(tmp_path / 'volumes.db'), 3600)
+    assert reader.volumes('csm:9559', '2107.A') == VOLUMES
+    assert reader.is_fresh('csm:9559', '2107.A')
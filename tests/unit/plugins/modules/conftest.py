@@ -0,0 +1,32 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import sys
+import types
+
+import pytest
+
+from ansible.module_utils import basic
+from ansible_collections.ibm.csm.plugins.module_utils import ibm_csm_client
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import CLIENT_MODULES, FakeCSMServer, exit_json, fail_json
+
+
+@pytest.fixture
+def csm_server(monkeypatch):
+    server = FakeCSMServer()
+    for variable in ('CSM_RECORD_DIR', 'CSM_REPLAY_DIR', 'CSM_MAX_CALLS_PER_SECOND', 'CSM_MAX_CONCURRENT_CALLS'):
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setitem(sys.modules, 'pyCSM', types.ModuleType('pyCSM'))
+    monkeypatch.setitem(sys.modules, 'pyCSM.clients', types.ModuleType('pyCSM.clients'))
+    for kind, module_name, class_name in CLIENT_MODULES:
+        module = types.ModuleType(module_name)
+        setattr(module, class_name, server.client_class(kind))
+        monkeypatch.setitem(sys.modules, module_name, module)
+    monkeypatch.setattr(ibm_csm_client, 'HAS_PYCSM', True)
+    monkeypatch.setattr(basic.AnsibleModule, 'exit_json', exit_json)
+    monkeypatch.setattr(basic.AnsibleModule, 'fail_json', fail_json)
+    return server
@@ -0,0 +1,17 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+
+def test_check_mode_reports_the_copysets_of_a_file_as_a_change(csm_server, tmp_path):
+    copysets_file = tmp_path / 'copysets.csv'
+    copysets_file.write_text('DS8000:2107.A:VOL:0001,DS8000:2107.B:VOL:0001\nDS8000:2107.A:VOL:0002,DS8000:2107.B:VOL:0002\n')
+    result = run_module('ibm_csm_copyset_manage', dict(name='mm_sess', copysets_file=str(copysets_file), role_order="['H1', 'H2']"),
+                        check_mode=True)
+    assert result['changed'] and result['result']['copysets'] == 2
+    assert csm_server.calls == []
@@ -0,0 +1,122 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible_collections.ibm.csm.plugins.modules.ibm_csm_info import _SubsetResults
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+
+def test_volume_list_by_wwn_without_wwn_name(csm_server):
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], gather_error_fail=False))
+    assert not result.get('failed')
+    assert 'wwn_name' in result['gather_errors']['hardware_volume_list_by_wwn']
+    assert csm_server.calls == []
+
+
+def test_svchosts_list_without_device_id(csm_server):
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_svchosts_list'], gather_error_fail=False))
+    assert not result.get('failed')
+    assert 'device_id' in result['gather_errors']['hardware_svchosts_list']
+    assert csm_server.calls == []
+
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_svchosts_list']))
+    assert result['failed'] and 'device_id' in result['msg']
+
+
+def test_all_storage_systems_ignore_the_device_type_of_other_subsets(csm_server):
+    device_types = []
+    csm_server.handlers['get_devices'] = lambda device_type: device_types.append(device_type) or [{'name': device_type + '_1'}]
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_device_list', 'hardware_path_list', 'hardware_svchosts_list'],
+                                             device_type='flashsystem', system_id=['all'], device_id=['all']))
+    assert sorted(result['hardware_path_list']) == ['ds8000_1']
+    assert sorted(result['hardware_svchosts_list']) == ['svc_1']
+    assert sorted(device_types) == ['ds8000', 'flashsystem', 'svc']
+
+
+def test_volume_list_by_wwn_scans_devices_named_under_any_key(csm_server):
+    csm_server.handlers['get_devices'] = lambda device_type: [{'deviceName': 'FS9100'}, {'id': 'FS7200'}]
+    csm_server.handlers['get_volumes'] = lambda system_name: {'volumes': [{'id': system_name, 'wwn': system_name + '01'}]}
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], wwn_scan_systems=['all'],
+                                             wwn_name=['FS9100', 'FS7200'], wwn_bulk_threshold=1))
+    assert result['hardware_volume_list_by_wwn'] == {'FS9100': [{'id': 'FS9100', 'wwn': 'FS910001'}],
+                                                     'FS7200': [{'id': 'FS7200', 'wwn': 'FS720001'}]}
+
+
+def test_volume_list_by_wwn_is_keyed_by_wwn(csm_server):
+    csm_server.handlers['get_volumes_by_wwn'] = lambda wwn_name: {'msg': 'IWNR1234I', 'data': [{'id': 'vol_' + wwn_name, 'wwn': wwn_name}]}
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], wwn_name=['A01']))
+    assert result['hardware_volume_list_by_wwn'] == {'A01': [{'id': 'vol_A01', 'wwn': 'A01'}]}
+
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], wwn_name=['A01', 'B01']))
+    assert result['hardware_volume_list_by_wwn'] == {'A01': [{'id': 'vol_A01', 'wwn': 'A01'}], 'B01': [{'id': 'vol_B01', 'wwn': 'B01'}]}
+
+
+def test_volume_list_by_wwn_queries_the_wwns_not_on_the_scanned_systems(csm_server):
+    csm_server.handlers['get_volumes'] = lambda system_name: {'volumes': [{'id': 'vol_A01', 'wwn': 'A01'}]}
+    csm_server.handlers['get_volumes_by_wwn'] = lambda wwn_name: {'data': [{'id': 'vol_' + wwn_name, 'wwn': wwn_name}]}
+    result = run_module('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], wwn_scan_systems=['FS9100'],
+                                             wwn_name=['A01', 'B01'], wwn_bulk_threshold=1))
+    assert result['hardware_volume_list_by_wwn'] == {'A01': [{'id': 'vol_A01', 'wwn': 'A01'}], 'B01': [{'id': 'vol_B01', 'wwn': 'B01'}]}
+    assert csm_server.calls == [('hardware', 'get_volumes'), ('hardware', 'get_volumes_by_wwn')]
+
+
+def test_columnar_output_keeps_call_stats_and_errors():
+    results = _SubsetResults(columnar=True)
+    results['session_list'] = [{'name': 'mm_sess', 'state': 'Prepared'}]
+    results['call_stats'] = {'calls': 1, 'queued_calls': [{'call': 'get_session_overviews', 'seconds': 0.5}]}
+    results['gather_errors'] = {'hardware_path_list': [{'system_id': 'dev1', 'error': 'timeout'}]}
+    assert results['session_list'] == {'columns': ['name', 'state'], 'rows': [['mm_sess', 'Prepared']]}
+    assert results['call_stats']['queued_calls'] == [{'call': 'get_session_overviews', 'seconds': 0.5}]
+    assert results['gather_errors'] == {'hardware_path_list': [{'system_id': 'dev1', 'error': 'timeout'}]}
+
+
+def test_no_client_is_built_when_no_subset_needs_it(csm_server, tmp_path):
+    csm_server.handlers['get_volumes'] = lambda system_name: {'volumes': [{'id': 'vol_0001', 'wwn': 'A01'}]}
+    args = dict(gather_subset=['hardware_volume_list_by_system'], system_name='dev1', volume_catalog=str(tmp_path / 'volumes.db'))
+    run_module('ibm_csm_info', args)
+    assert csm_server.logins == ['hardware']
+
+    # Answered from the fresh catalog
+    del csm_server.logins[:], csm_server.calls[:]
+    result = run_module('ibm_csm_info', args)
+    assert csm_server.logins == [] and csm_server.calls == []
+    assert result['call_stats']['logins'] == 0
+
+
+def test_volume_catalog_is_kept_per_server_port(csm_server, tmp_path):
+    csm_server.handlers['get_volumes'] = lambda system_name: {'volumes': [{'id': 'vol_0001', 'wwn': 'A01'}]}
+    args = dict(gather_subset=['hardware_volume_list_by_system'], system_name='dev1', volume_catalog=str(tmp_path / 'volumes.db'))
+    run_module('ibm_csm_info', dict(args, port=9559))
+    run_module('ibm_csm_info', dict(args, port=9559))
+    run_module('ibm_csm_info', dict(args, port=9560))
+    assert csm_server.calls == [('hardware', 'get_volumes'), ('hardware', 'get_volumes')]
+
+
+def test_call_stats_report_the_transfer_sizes(csm_server):
+    sessions = [{'name': 'sess_{0}'.format(number), 'type': 'MM', 'state': 'Prepared', 'status': 'Normal'} for number in range(200)]
+    csm_server.handlers['get_session_overviews'] = lambda: sessions
+    csm_server.content_encoding = 'gzip'
+    result = run_module('ibm_csm_info', dict(gather_subset=['session_list']))
+    stats = result['call_stats']
+    assert stats['calls'] == 1 and stats['content_encodings'] == {'gzip': 1}
+    assert stats['bytes_decoded'] == len(json.dumps(sessions))
+    assert 0 < stats['bytes_received'] < stats['bytes_decoded'] // 10
+
+
+def test_session_topology_join(csm_server):
+    csm_server.handlers['get_copysets'] = lambda name: {'copysets': [{'copysetID': 'DS8000:2107.A:VOL:0001',
+                                                                      'volumes': [{'role': 'H1', 'volumeId': 'DS8000:2107.A:VOL:0001'},
+                                                                                  {'role': 'H2', 'volumeId': 'DS8000:2107.B:VOL:0001'}]}]}
+    csm_server.handlers['get_volumes'] = lambda system_name: {'volumes': [{'id': 'DS8000:{0}:VOL:0001'.format(system_name), 'name': 'vol_0001',
+                                                                           'wwn': '6005076303FFD{0}0001'.format(system_name[-1])}]}
+    result = run_module('ibm_csm_info', dict(gather_subset=['session_topology'], name='mm_sess'))
+    assert result['session_topology'] == [
+        {'session': 'mm_sess', 'copyset': 'DS8000:2107.A:VOL:0001', 'role': 'H1', 'volume': 'DS8000:2107.A:VOL:0001',
+         'volume_name': 'vol_0001', 'storage_system': '2107.A', 'wwn': '6005076303FFDA0001'},
+        {'session': 'mm_sess', 'copyset': 'DS8000:2107.A:VOL:0001', 'role': 'H2', 'volume': 'DS8000:2107.B:VOL:0001',
+         'volume_name': 'vol_0001', 'storage_system': '2107.B', 'wwn': '6005076303FFDB0001'}]
@@ -0,0 +1,33 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+
+def test_dest_is_only_written_when_the_metrics_change(csm_server, tmp_path):
+    sessions = [{'name': 'mm_sess', 'state': 'Prepared'}]
+    csm_server.handlers['get_session_overviews_short'] = lambda: sessions
+    dest = tmp_path / 'csm.prom'
+    cache_file = tmp_path / 'csm.prom.cache.json'
+
+    assert run_module('ibm_csm_metrics', dict(dest=str(dest)))['changed']
+    written = dest.read_text()
+
+    # Only the cache age differs
+    cache = json.loads(cache_file.read_text())
+    cache['fetched'] -= 5
+    cache_file.write_text(json.dumps(cache))
+    result = run_module('ibm_csm_metrics', dict(dest=str(dest)))
+    assert result['cached'] and 'csm_cache_age_seconds{server="csm.example.com"} 5' in result['metrics']
+    assert not result['changed']
+    assert dest.read_text() == written
+
+    sessions[0]['state'] = 'Suspended'
+    assert run_module('ibm_csm_metrics', dict(dest=str(dest), refresh_interval=0))['changed']
+    assert 'state="Suspended"' in dest.read_text()
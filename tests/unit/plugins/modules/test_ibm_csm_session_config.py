@@ -0,0 +1,45 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+SESSIONS = {'mm_sess_1': {'name': 'mm_sess_1', 'type': 'MM', 'description': 'payroll'},
+            'mm_sess_2': {'name': 'mm_sess_2', 'type': 'MM', 'description': 'old'}}
+
+
+def _server(csm_server):
+    csm_server.handlers['get_session_overviews_short'] = lambda: list(SESSIONS.values())
+    csm_server.handlers['get_session_info'] = lambda name: {'msg': 'IWNR1234I', 'data': SESSIONS[name]}
+
+
+def test_session_info_is_read_from_its_data(csm_server):
+    _server(csm_server)
+    result = run_module('ibm_csm_session_config', dict(sessions=[dict(name=name, type='MM', description='payroll')
+                                                                 for name in sorted(SESSIONS)]), check_mode=True)
+    assert result['plan'] == [{'session': 'mm_sess_2', 'action': 'set_description', 'description': 'payroll'}]
+    assert sorted(csm_server.calls) == [('session', 'get_session_info')] * 2 + [('session', 'get_session_overviews_short')]
+
+
+def test_type_of_an_existing_session_cannot_change(csm_server):
+    _server(csm_server)
+    result = run_module('ibm_csm_session_config', dict(sessions=[dict(name='mm_sess_1', type='GM')]), check_mode=True)
+    assert result['failed']
+    assert 'is of type MM' in result['msg']
+
+
+def test_read_errors_are_reported_per_session(csm_server):
+    _server(csm_server)
+
+    def get_session_options(name):
+        raise ValueError('no options for ' + name)
+
+    csm_server.handlers['get_session_options'] = get_session_options
+    result = run_module('ibm_csm_session_config', dict(sessions=[dict(name=name, options=dict(resetReserve=True))
+                                                                 for name in sorted(SESSIONS)]))
+    assert result['failed']
+    assert 'mm_sess_1 [no options for mm_sess_1]' in result['msg'] and 'mm_sess_2' in result['msg']
+    assert ('session', 'set_session_options') not in csm_server.calls
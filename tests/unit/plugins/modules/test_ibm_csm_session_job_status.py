@@ -0,0 +1,35 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+SESSION_OVERVIEWS = [{'name': 'mm_sess', 'state': 'Preparing', 'status': 'Warning'},
+                     {'name': 'gm_sess', 'state': 'Prepared', 'status': 'Normal'},
+                     {'name': 'fc_sess', 'state': 'Target Available', 'status': 'Normal'}]
+
+
+def test_sessions_in_a_transitional_state_are_pending(csm_server):
+    csm_server.handlers['get_session_overviews_short'] = lambda: SESSION_OVERVIEWS
+    result = run_module('ibm_csm_session_job_status', dict(sessions=['mm_sess', 'gm_sess', 'fc_sess']))
+    assert result['sessions'] == {'mm_sess': {'state': 'Preparing', 'status': 'Warning', 'finished': False},
+                                  'gm_sess': {'state': 'Prepared', 'status': 'Normal', 'finished': True},
+                                  'fc_sess': {'state': 'Target Available', 'status': 'Normal', 'finished': True}}
+    assert result['pending'] == 1 and not result['finished']
+    assert csm_server.calls == [('session', 'get_session_overviews_short')]
+
+
+def test_sessions_finish_in_the_expected_states(csm_server):
+    csm_server.handlers['get_session_overviews_short'] = lambda: SESSION_OVERVIEWS
+    result = run_module('ibm_csm_session_job_status', dict(sessions=['gm_sess', 'fc_sess'], states=['Prepared']))
+    assert result['sessions']['gm_sess']['finished'] and not result['sessions']['fc_sess']['finished']
+    assert not result['finished']
+
+
+def test_unknown_session_fails(csm_server):
+    csm_server.handlers['get_session_overviews_short'] = lambda: SESSION_OVERVIEWS
+    result = run_module('ibm_csm_session_job_status', dict(sessions=['no_sess']))
+    assert result['failed'] and 'no_sess' in result['msg']
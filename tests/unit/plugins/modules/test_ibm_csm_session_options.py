@@ -0,0 +1,16 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+
+def test_check_mode_only_reads(csm_server):
+    csm_server.handlers['get_session_options'] = lambda name: {'consistencyGroupInterval': '10'}
+    result = run_module('ibm_csm_session_options', dict(sessions=[dict(name='mm_sess', options=dict(consistencyGroupInterval=30))]),
+                        check_mode=True)
+    assert result['changed']
+    assert csm_server.calls == [('session', 'get_session_options')]
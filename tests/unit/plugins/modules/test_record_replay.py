@@ -0,0 +1,28 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+
+def _rest_put(url, data, headers):
+    headers['X-Auth-Token'] = 'token'
+    return {'msg': 'IWNR1234I', 'msgTranslated': 'ok'}
+
+
+def test_session_options_recorded_then_replayed(csm_server, tmp_path):
+    csm_server.handlers['get_session_options'] = lambda name: {'resetReserve': 'false'}
+    csm_server.handlers['rest_put'] = _rest_put
+    args = dict(sessions=[dict(name='mm_sess', options=dict(resetReserve=True))])
+
+    recorded = run_module('ibm_csm_session_options', dict(args, record_dir=str(tmp_path)))
+    assert recorded['changed'] and not recorded.get('failed')
+    del csm_server.logins[:], csm_server.calls[:]
+
+    replayed = run_module('ibm_csm_session_options', dict(args, replay_dir=str(tmp_path), replay_latency=0.0))
+    assert not replayed.get('failed'), replayed.get('msg')
+    assert replayed['sessions'] == recorded['sessions']
+    assert csm_server.logins == [] and csm_server.calls == []
@@ -0,0 +1,111 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+# The number of logins and REST calls each module makes for a task.  A change that makes more calls
+# fails here: raise the budget only when the extra round trips are intended.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.ibm.csm.tests.unit.plugins.modules.utils import run_module
+
+SESSION_OVERVIEWS = [{'name': 'sgc_sess', 'type': 'SGC', 'state': 'Protected', 'copyProgress': 100},
+                     {'name': 'mm_sess', 'type': 'MM', 'state': 'Prepared', 'copyProgress': 100},
+                     {'name': 'sgc_svc_sess', 'type': 'SGCSVC', 'state': 'Protected', 'copyProgress': 100}]
+
+HANDLERS = {
+    'get_session_overviews_short': lambda: SESSION_OVERVIEWS,
+    'get_session_info': lambda name: {'name': name, 'rolepairs': [{'name': 'H1-H2'}, {'name': 'H2-H3'}, {'name': 'H1-H3'}]},
+    'get_devices': lambda device_type: {'data': [{'name': 'dev1'}, {'name': 'dev2'}, {'name': 'dev3'}]},
+    'get_recovered_backups': lambda name: {'backups': [{'backupId': '1659891600'}, {'backupId': '1659895200'}]},
+    'get_session_options': lambda name: {'consistencyGroupInterval': '10'},
+    'get_copysets': lambda name: {'copysets': [{'copysetID': 'DS8000:2107.A:VOL:0001',
+                                                'volumes': [{'role': 'H1', 'volumeId': 'DS8000:2107.A:VOL:0001'},
+                                                            {'role': 'H2', 'volumeId': 'DS8000:2107.B:VOL:0001'}]}]},
+    'get_volumes': lambda system_name: {'volumes': [{'id': 'DS8000:{0}:VOL:0001'.format(system_name), 'name': 'vol_0001',
+                                                     'wwn': '6005076303FFD{0}0001'.format(system_name[-1])}]},
+}
+
+# (module, arguments, logins, calls)
+BUDGETS = [
+    ('ibm_csm_info', dict(gather_subset=['session_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_list_short']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['scheduled_task_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['hardware_path_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['hardware_device_list'], device_type='ds8000'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['hardware_svchosts_list'], device_id='dev1'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_log_event_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_log_packages_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_session_supported_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_version_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_volume_count_list']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['system_active_standby_status']), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['copyset_list'], name='mm_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['copyset_pair_list'], name='mm_sess', rolepair='H1-H2'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_detail'], name='mm_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_command_list'], name='mm_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_option_list'], name='mm_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_rolepair_list'], name='mm_sess', rolepair='H1-H2'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_recovered_backup_list'], name='sgc_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_recovered_backup_list'], name='sgc_sess', to_time=1659891600, latest=True), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_snapshot_clone_list'], name='sgc_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_backup_detail'], name='sgc_sess', role='H1', backup_id=1659891600), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_recovered_backup_detail'], name='sgc_sess', backup_id=1659891600), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_snapshot_clone_detail'], name='sgc_sess', snapshot='snap0'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_snapshot_detail'], name='sgc_sess', role='H1', snapshot='snap0'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_system'], system_name='dev1'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['hardware_volume_list_by_wwn'], wwn_name=['6005076810810261F800000000000001']), 1, 1),
+    # One login per client used, however many subsets it serves
+    ('ibm_csm_info', dict(gather_subset=['session_list', 'session_list_short', 'scheduled_task_list']), 1, 3),
+    ('ibm_csm_info', dict(gather_subset=['session_list', 'system_version_list', 'hardware_path_list']), 3, 3),
+    ('ibm_csm_info', dict(gather_subset=['all']), 3, 10),
+    ('ibm_csm_info', dict(gather_subset=['all'], name='mm_sess'), 3, 16),
+    # Fan-out: one call per role pair, storage system or Safeguarded Copy session, after one discovery call
+    ('ibm_csm_info', dict(gather_subset=['copyset_pair_list'], name='mm_sess', rolepair='all'), 1, 4),
+    ('ibm_csm_info', dict(gather_subset=['copyset_pair_list', 'session_rolepair_list'], name='mm_sess', rolepair='all'), 1, 7),
+    ('ibm_csm_info', dict(gather_subset=['hardware_path_list'], system_id='all'), 1, 4),
+    ('ibm_csm_info', dict(gather_subset=['hardware_svchosts_list'], device_id=['dev1', 'dev2']), 1, 2),
+    ('ibm_csm_info', dict(gather_subset=['session_backup_analytics']), 1, 3),
+    ('ibm_csm_info', dict(gather_subset=['session_backup_analytics'], name='sgc_sess'), 1, 1),
+    ('ibm_csm_info', dict(gather_subset=['session_topology']), 2, 6),
+    ('ibm_csm_info', dict(gather_subset=['session_topology'], name='mm_sess'), 2, 3),
+    ('ibm_csm_session_action', dict(name='mm_sess', command='Start H1->H2'), 1, 1),
+    ('ibm_csm_scheduled_task_action', dict(id=1, action='run'), 1, 1),
+    ('ibm_csm_active_standby_action', dict(action='reconnect'), 1, 1),
+    ('ibm_csm_run_any_rest_call', dict(path_resource='/sessions', action='get'), 1, 1),
+    ('ibm_csm_copyset_manage', dict(name='mm_sess', copysets="[['DS8000:2107.A:VOL:0001','DS8000:2107.B:VOL:0001']]",
+                                    role_order="['H1', 'H2']"), 1, 1),
+    ('ibm_csm_copyset_manage', dict(name='mm_sess', copysets="['DS8000:2107.A:VOL:0001']", state='absent'), 1, 1),
+    ('ibm_csm_session_manage', dict(name='new_sess', type='MM'), 1, 1),
+    ('ibm_csm_session_manage', dict(name='mm_sess', state='absent'), 1, 1),
+    ('ibm_csm_session_manage', dict(volume_groups=[dict(volume_group='SVC:VOLGROUP:DEV:sgc_svc_sess', type='SnapshotSVC'),
+                                                   dict(volume_group='SVC:VOLGROUP:DEV:vg1', type='SnapshotSVC'),
+                                                   dict(volume_group='SVC:VOLGROUP:DEV:vg2', type='SnapshotSVC')]), 1, 3),
+    ('ibm_csm_session_options', dict(sessions=[dict(name='mm_sess', options=dict(consistencyGroupInterval=10)),
+                                               dict(name='sgc_sess', options=dict(consistencyGroupInterval=30))]), 2, 3),
+    ('ibm_csm_session_progress', dict(sessions=['mm_sess', 'sgc_sess']), 1, 1),
+    # Only the parts of a session its spec sets are read, and only the differences are applied
+    ('ibm_csm_session_config', dict(sessions=[dict(name='mm_sess', options=dict(consistencyGroupInterval=10))]), 1, 2),
+    ('ibm_csm_session_config', dict(sessions=[dict(name='mm_sess', type='MM', options=dict(consistencyGroupInterval=10))]), 1, 3),
+    ('ibm_csm_session_config', dict(sessions=[dict(name='mm_sess', options=dict(consistencyGroupInterval=30)),
+                                              dict(name='sgc_sess', options=dict(consistencyGroupInterval=30))]), 2, 5),
+    ('ibm_csm_session_config', dict(sessions=[dict(name='new_sess', type='MM')]), 1, 2),
+    ('ibm_csm_session_job_status', dict(sessions=['mm_sess', 'sgc_sess', 'sgc_svc_sess']), 1, 1),
+    ('ibm_csm_metrics', dict(), 2, 3),
+]
+
+
+@pytest.mark.parametrize('module, args, logins, calls', BUDGETS,
+                         ids=['{0}-{1}'.format(budget[0], '-'.join('{0}={1}'.format(key, value) for key, value in sorted(budget[1].items())))
+                              [:120] for budget in BUDGETS])
+def test_round_trip_budget(csm_server, module, args, logins, calls):
+    csm_server.handlers.update(HANDLERS)
+    result = run_module(module, args)
+    assert not result.get('failed'), result.get('msg')
+    assert len(csm_server.logins) == logins, csm_server.logins
+    assert len(csm_server.calls) == calls, csm_server.calls
+    assert result['call_stats']['logins'] == logins
+    assert result['call_stats']['calls'] == calls
@@ -0,0 +1,110 @@
+# Copyright (C) 2022 IBM CORPORATION
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import importlib
+import io
+import json
+
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+
+CLIENT_MODULES = (('session', 'pyCSM.clients.session_client', 'sessionClient'),
+                  ('hardware', 'pyCSM.clients.hardware_client', 'hardwareClient'),
+                  ('system', 'pyCSM.clients.system_client', 'systemClient'))
+
+
+# Like the SystemExit raised by the real exit_json and fail_json, these are not caught by the
+# "except Exception" of the modules.
+class AnsibleExitJson(BaseException):
+    pass
+
+
+class AnsibleFailJson(BaseException):
+    pass
+
+
+def exit_json(*args, **kwargs):
+    kwargs.setdefault('changed', False)
+    raise AnsibleExitJson(kwargs)
+
+
+def fail_json(*args, **kwargs):
+    kwargs['failed'] = True
+    raise AnsibleFailJson(kwargs)
+
+
+class FakeResponse(object):
+    """A requests response, whose raw stream has read the body in the content encoding, if any."""
+
+    def __init__(self, data, content_encoding=None):
+        self.status_code = 200
+        self.headers = {'Content-Type': 'application/json'}
+        self.content = json.dumps(data).encode('utf-8')
+        self.raw = None
+        if content_encoding == 'gzip':
+            self.headers['Content-Encoding'] = content_encoding
+            self.raw = io.BytesIO()
+            self.raw.write(gzip.compress(self.content))
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeCSMServer(object):
+    """
+    Stands for the pyCSM client classes: every client created is a login and every method called a REST
+    call.  A call answers with the result of its handler, or with an informational message, in content_encoding.
+    """
+
+    def __init__(self):
+        self.logins = []
+        self.calls = []
+        self.handlers = {}
+        self.content_encoding = None
+
+    def client_class(self, kind):
+        server = self
+
+        class FakeClient(object):
+            def __init__(self, server_address, server_port, username=None, password=None):
+                server.logins.append(kind)
+                self.base_url = 'https://{0}:{1}/CSM/web'.format(server_address, server_port)
+                self.tk = 'token'
+
+            def change_properties(self, properties):
+                return properties
+
+            def __getattr__(self, name):
+                if name.startswith('__'):
+                    raise AttributeError(name)
+
+                def call(*args, **kwargs):
+                    server.calls.append((kind, name))
+                    handler = server.handlers.get(name)
+                    return FakeResponse(handler(*args, **kwargs) if handler else {'msg': 'IWNR0000I', 'msgTranslated': 'ok'},
+                                        server.content_encoding)
+
+                return call
+
+        return FakeClient
+
+
+def run_module(name, args, check_mode=False):
+    """Run the module with the arguments and return its result."""
+    args = dict(dict(hostname='csm.example.com', username='csm_user', password='csm_password'), **args)
+    if check_mode:
+        args['_ansible_check_mode'] = True
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': args}))
+    if hasattr(basic, '_ANSIBLE_PROFILE'):
+        basic._ANSIBLE_PROFILE = 'legacy'
+    module = importlib.import_module('ansible_collections.ibm.csm.plugins.modules.' + name)
+    try:
+        module.main()
+    except (AnsibleExitJson, AnsibleFailJson) as e:
+        return e.args[0]
+    raise AssertionError("{0} returned without calling exit_json or fail_json".format(name))